@@ -0,0 +1,100 @@
+"""
+Tests for the synthetic scaling benchmark in
+``transfer_genius/benchmarks/transformations.py``.
+
+The benchmark is run at its smallest size to check the report layout,
+and the baseline comparison is exercised with hand-written reports so
+no timing noise is involved.
+"""
+
+from __future__ import annotations
+
+from transfer_genius.benchmarks.transformations import (
+    baseline_portable,
+    comparar_con_baseline,
+    exponente_escalado,
+    generar_tablas_fbref,
+    medir_etapas,
+)
+
+
+def test_generar_tablas_fbref_has_fbref_layout():
+    tablas = generar_tablas_fbref(1, 1)
+    assert len(tablas) == 10
+    assert tablas[0].columns.nlevels == 2
+    # Una fila de cabecera repetida cada 25 jugadores
+    assert (tablas[0][("Unnamed: 0_level_0", "Player")] == "Player").sum() == 20
+
+
+def test_medir_etapas_reports_every_stage():
+    etapas = medir_etapas(1, 1)
+    assert set(etapas) == {
+        "limpiar_tabla",
+        "merge_controlado_por_player",
+        "parse_market_value",
+        "concat_temporadas",
+    }
+    for resultado in etapas.values():
+        assert resultado["seconds"] >= 0
+        assert resultado["rows"] == 500
+
+
+def test_comparar_con_baseline_flags_slower_and_superlinear_stages():
+    baseline = {
+        "stages": {
+            "merge": {
+                "points": [
+                    {"leagues": 1, "rows": 500, "seconds": 1.0, "peak_mb": 10.0},
+                    {"leagues": 5, "rows": 2500, "seconds": 5.0, "peak_mb": 50.0},
+                ],
+                "scaling_exponent": 1.0,
+            }
+        }
+    }
+    igual = {
+        "stages": {
+            "merge": {
+                "points": [
+                    {"leagues": 1, "rows": 500, "seconds": 1.1, "peak_mb": 10.5},
+                    {"leagues": 5, "rows": 2500, "seconds": 5.2, "peak_mb": 51.0},
+                ],
+                "scaling_exponent": 1.02,
+            }
+        }
+    }
+    peor = {
+        "stages": {
+            "merge": {
+                "points": [
+                    {"leagues": 1, "rows": 500, "seconds": 1.0, "peak_mb": 10.0},
+                    {"leagues": 5, "rows": 2500, "seconds": 20.0, "peak_mb": 50.0},
+                ],
+                "scaling_exponent": exponente_escalado([1, 5], [1.0, 20.0]),
+            }
+        }
+    }
+    assert comparar_con_baseline(igual, baseline) == []
+    assert len(comparar_con_baseline(peor, baseline)) == 2
+
+
+def test_comparar_con_baseline_flags_memory_without_times():
+    """A portable baseline has no times but still catches memory growth."""
+    informe = {
+        "leagues": [1],
+        "seasons": 1,
+        "stages": {
+            "merge": {
+                "points": [
+                    {"leagues": 1, "rows": 500, "seconds": 9.0, "peak_mb": 10.0}
+                ],
+                "scaling_exponent": None,
+            }
+        },
+    }
+    baseline = baseline_portable(informe)
+    assert "seconds" not in baseline["stages"]["merge"]["points"][0]
+
+    informe["stages"]["merge"]["points"][0].update(seconds=99.0, peak_mb=20.0)
+    regresiones = comparar_con_baseline(informe, baseline)
+    assert len(regresiones) == 1
+    assert "MB" in regresiones[0]
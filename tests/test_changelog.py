@@ -0,0 +1,169 @@
+"""
+Tests for the change-data-capture stage in
+``transfer_genius/etl/changelog.py``.
+
+Two small snapshots of ``jugadores_laliga_<year>.csv`` are compared to
+check that inserts, deletes, transfers and field updates are detected,
+and that each run appends a new file to the season's partition of the
+log instead of rewriting it.
+"""
+
+from __future__ import annotations
+
+import pathlib
+
+import pandas as pd
+
+from transfer_genius.etl.changelog import (
+    diff_snapshots,
+    leer_cambios,
+    registrar_cambios,
+)
+from transfer_genius.etl.scraper_transfermarkt import save_season_csv
+
+
+def _snapshot(filas: list[tuple]) -> pd.DataFrame:
+    df = pd.DataFrame(
+        filas,
+        columns=[
+            "player",
+            "tm_player_id",
+            "season",
+            "tm_club_id",
+            "club",
+            "position",
+            "market_value_eur",
+            "birth_date",
+            "age",
+        ],
+    )
+    # Columnas derivadas que no deben generar cambios propios
+    df["mv_millions"] = df["market_value_eur"] / 1e6
+    df["market_value"] = "€" + df["mv_millions"].astype(str) + "m"
+    return df
+
+
+ANTERIOR = _snapshot(
+    [
+        ("Ana", 1, "2024/25", 10, "Betis", "Centre-Back", 10e6, "2000-06-24", 24),
+        ("Bea", 2, "2024/25", 10, "Betis", "Goalkeeper", 5e6, "1994-01-01", 30),
+        ("Cris", 3, "2024/25", 10, "Betis", "Right Winger", 8e6, "2003-03-03", 21),
+    ]
+)
+# Ana cumple años entre ambos scrapes y Cris cambia de club
+NUEVO = _snapshot(
+    [
+        ("Ana", 1, "2024/25", 10, "Betis", "Centre-Back", 12e6, "2000-06-24", 25),
+        ("Cris", 3, "2024/25", 20, "Elche", "Right Winger", 9e6, "2003-03-03", 21),
+        ("Dani", 4, "2024/25", 10, "Betis", "Striker", 1e6, None, None),
+    ]
+)
+
+
+def test_diff_snapshots_detects_every_change_type():
+    cambios = diff_snapshots(ANTERIOR, NUEVO)
+    por_tipo = {t: g for t, g in cambios.groupby("change_type")}
+
+    assert set(por_tipo) == {"insert", "delete", "transfer", "update"}
+    assert por_tipo["insert"]["tm_player_id"].tolist() == [4]
+    assert por_tipo["delete"]["tm_player_id"].tolist() == [2]
+    traspaso = por_tipo["transfer"].iloc[0]
+    assert (traspaso["tm_player_id"], traspaso["old_value"], traspaso["new_value"]) == (
+        3,
+        "10",
+        "20",
+    )
+    # Sólo el valor en euros genera cambio: ni mv_millions ni market_value
+    # (derivados), ni la edad de Ana, ni el nombre del club de Cris (ya
+    # recogido en el traspaso).  El valor de Cris se registra aunque cambie
+    # de club a la vez
+    updates = por_tipo["update"].sort_values("tm_player_id")
+    assert updates["field"].tolist() == ["market_value_eur", "market_value_eur"]
+    assert updates["tm_player_id"].tolist() == [1, 3]
+    assert updates["tm_club_id"].tolist() == [10, 20]
+    assert updates["new_value"].tolist() == ["12000000.0", "9000000.0"]
+
+
+def test_registrar_cambios_appends_partitioned_log(tmp_path: pathlib.Path):
+    out_csv = tmp_path / "jugadores_laliga_2024.csv"
+    log_dir = tmp_path / "changelog"
+
+    assert (
+        registrar_cambios(out_csv, ANTERIOR, "transfermarkt", 2024, log_dir=log_dir)
+        is None
+    )
+    ANTERIOR.to_csv(out_csv, index=False)
+    registrar_cambios(out_csv, NUEVO, "transfermarkt", 2024, log_dir=log_dir)
+    NUEVO.to_csv(out_csv, index=False)
+    sin_cambios = registrar_cambios(
+        out_csv, NUEVO, "transfermarkt", 2024, log_dir=log_dir
+    )
+
+    assert sin_cambios is not None and sin_cambios.empty
+    ficheros = list((log_dir / "transfermarkt" / "season=2024").glob("*.csv"))
+    assert len(ficheros) == 1
+    assert len(leer_cambios("transfermarkt", 2024, log_dir=log_dir)) == 5
+
+
+def test_reparse_entries_are_marked_and_hidden_by_default(tmp_path: pathlib.Path):
+    """Re-parse corrections are logged as ``origin="reparse"`` and hidden by default."""
+    out_csv = tmp_path / "jugadores_laliga_2024.csv"
+    log_dir = tmp_path / "changelog"
+    ANTERIOR.to_csv(out_csv, index=False)
+
+    registrar_cambios(
+        out_csv, NUEVO, "transfermarkt", 2024, origen="reparse", log_dir=log_dir
+    )
+
+    assert leer_cambios("transfermarkt", 2024, log_dir=log_dir).empty
+    todos = leer_cambios("transfermarkt", 2024, origen=None, log_dir=log_dir)
+    assert set(todos["origin"]) == {"reparse"}
+
+
+def test_save_season_csv_skips_diff_when_new_version_has_no_ids(
+    tmp_path: pathlib.Path,
+):
+    """A season whose pages all parse empty is still written, without a diff."""
+    log_dir = tmp_path / "changelog"
+    ANTERIOR.to_csv(tmp_path / "jugadores_laliga_2024.csv", index=False)
+
+    assert (
+        registrar_cambios(
+            tmp_path / "jugadores_laliga_2024.csv",
+            pd.DataFrame(),
+            "transfermarkt",
+            2024,
+            log_dir=log_dir,
+        )
+        is None
+    )
+    out_csv = save_season_csv(2024, pd.DataFrame({"player": []}), out_dir=tmp_path)
+
+    assert list(pd.read_csv(out_csv).columns) == ["player", "season"]
+    assert not log_dir.exists()
+
+
+def test_detected_at_works_as_a_cursor_across_partitions(tmp_path: pathlib.Path):
+    """Entries written later in the same second are still after the cursor."""
+    log_dir = tmp_path / "changelog"
+    for temporada in (2023, 2024):
+        ANTERIOR.to_csv(tmp_path / f"jugadores_laliga_{temporada}.csv", index=False)
+
+    registrar_cambios(
+        tmp_path / "jugadores_laliga_2023.csv",
+        NUEVO,
+        "transfermarkt",
+        2023,
+        log_dir=log_dir,
+    )
+    cursor = leer_cambios("transfermarkt", log_dir=log_dir)["detected_at"].max()
+    registrar_cambios(
+        tmp_path / "jugadores_laliga_2024.csv",
+        NUEVO,
+        "transfermarkt",
+        2024,
+        log_dir=log_dir,
+    )
+
+    nuevos = leer_cambios("transfermarkt", desde=cursor, log_dir=log_dir)
+    assert len(nuevos) == 5
@@ -0,0 +1,173 @@
+"""
+Tests for the Transfermarkt ↔ FBref id crosswalk.
+
+``extraer_id_tm`` pulls numeric ids out of Transfermarkt URLs and
+``emparejar_temporada`` pairs players from both sources by normalised
+name and age; ``emparejar_clubes`` derives the club pairs from them.
+Ambiguous names must never produce a pair, and pairs already persisted
+must not be reassigned.
+"""
+
+from __future__ import annotations
+
+import pathlib
+
+import pandas as pd
+
+from transfer_genius.etl.crosswalk import (
+    actualizar_crosswalk,
+    combinar_temporadas,
+    construir_crosswalk,
+    emparejar_clubes,
+    emparejar_temporada,
+)
+from transfer_genius.utils.ids import TM_PLAYER_ID, extraer_id_tm
+
+
+def test_extraer_id_tm_returns_nullable_integers():
+    urls = pd.Series(
+        [
+            "https://www.transfermarkt.com/pedri/profil/spieler/683840",
+            "",
+            None,
+        ]
+    )
+    ids = extraer_id_tm(urls, TM_PLAYER_ID)
+    assert str(ids.dtype) == "Int64"
+    assert ids.iloc[0] == 683840
+    assert ids.iloc[1:].isna().all()
+
+
+def test_emparejar_temporada_skips_ambiguous_names():
+    """Accents are ignored, ages may differ by one and duplicated names are dropped."""
+    df_tm = pd.DataFrame(
+        {
+            "player": ["Álvaro García", "Juan Pérez", "Juan Pérez"],
+            "age": [30, 22, 25],
+            "tm_player_id": [1, 2, 3],
+        }
+    )
+    df_fbref = pd.DataFrame(
+        {
+            "Player": ["Alvaro Garcia", "Juan Perez"],
+            "Age": ["29", "25"],
+            "fbref_player_id": ["aaaa1111", "bbbb2222"],
+        }
+    )
+    pares = emparejar_temporada(df_tm, df_fbref, "2023/24")
+
+    assert pares["tm_player_id"].tolist() == [1, 3]
+    assert pares["fbref_player_id"].tolist() == ["aaaa1111", "bbbb2222"]
+    assert (pares["season"] == "2023/24").all()
+
+
+def test_actualizar_crosswalk_keeps_existing_pairs(tmp_path: pathlib.Path):
+    path = tmp_path / "crosswalk.csv"
+    primero = pd.DataFrame(
+        {
+            "tm_player_id": [1],
+            "fbref_player_id": ["aaaa1111"],
+            "player": ["A"],
+            "season": ["2022/23"],
+        }
+    )
+    actualizar_crosswalk(primero, path)
+    segundo = pd.DataFrame(
+        {
+            "tm_player_id": [1, 2],
+            "fbref_player_id": ["cccc3333", "bbbb2222"],
+            "player": ["A", "B"],
+            "season": ["2023/24", "2023/24"],
+        }
+    )
+    crosswalk = actualizar_crosswalk(segundo, path)
+
+    assert crosswalk["tm_player_id"].tolist() == [1, 2]
+    assert crosswalk["fbref_player_id"].tolist() == ["aaaa1111", "bbbb2222"]
+
+
+def test_combinar_temporadas_drops_cross_season_conflicts():
+    """A pair repeated across seasons is kept once; conflicting ids are dropped."""
+    pares = pd.DataFrame(
+        {
+            "tm_player_id": [1, 1, 2, 2],
+            "fbref_player_id": ["aaaa1111", "aaaa1111", "bbbb2222", "cccc3333"],
+            "player": ["A", "A", "B", "B"],
+            "season": ["2022/23", "2023/24", "2022/23", "2023/24"],
+        }
+    )
+    combinados = combinar_temporadas(pares)
+
+    assert combinados["tm_player_id"].tolist() == [1]
+    assert combinados["season"].tolist() == ["2022/23"]
+
+
+def test_emparejar_clubes_keeps_mutual_majority():
+    """Each club goes to the squad most of its matched players play for."""
+    pares = pd.DataFrame(
+        {
+            "tm_player_id": [1, 2, 3, 4, 5],
+            "fbref_player_id": ["a", "b", "c", "d", "e"],
+        }
+    )
+    df_tm = pd.DataFrame(
+        {
+            "tm_player_id": [1, 2, 3, 4, 5],
+            "tm_club_id": [368, 368, 368, 418, 418],
+            "club": ["Sevilla FC"] * 3 + ["Real Madrid"] * 2,
+        }
+    )
+    # Player 3 appears in another squad on FBref (e.g. a loan)
+    df_fbref = pd.DataFrame(
+        {
+            "fbref_player_id": ["a", "b", "c", "d", "e"],
+            "fbref_squad_id": ["ad2be733"] * 2 + ["53a2f082"] * 3,
+        }
+    )
+    clubes = emparejar_clubes(pares, df_tm, df_fbref, "2023/24")
+
+    assert clubes.values.tolist() == [
+        [368, "ad2be733", "Sevilla FC", "2023/24"],
+        [418, "53a2f082", "Real Madrid", "2023/24"],
+    ]
+
+
+def test_construir_crosswalk_persists_players_and_clubs(tmp_path: pathlib.Path):
+    pd.DataFrame(
+        {
+            "player": ["Ana", "Bea"],
+            "age": [24, 30],
+            "tm_player_id": [1, 2],
+            "tm_club_id": [368, 418],
+            "club": ["Sevilla FC", "Real Madrid"],
+        }
+    ).to_csv(tmp_path / "jugadores_laliga_2023.csv", index=False)
+    pd.DataFrame(
+        {
+            "Player": ["Ana", "Bea"],
+            "Age": [24, 30],
+            "fbref_player_id": ["aaaa1111", "bbbb2222"],
+            "fbref_squad_id": ["ad2be733", "53a2f082"],
+        }
+    ).to_csv(tmp_path / "fbref_laliga_2023.csv", index=False)
+    jugadores = tmp_path / "crosswalk_players.csv"
+    clubes = tmp_path / "crosswalk_clubs.csv"
+
+    construir_crosswalk([2023], tmp_path, jugadores, clubes)
+
+    assert pd.read_csv(jugadores)["season"].tolist() == ["2023/24", "2023/24"]
+    assert pd.read_csv(clubes).values.tolist() == [
+        [368, "ad2be733", "Sevilla FC", "2023/24"],
+        [418, "53a2f082", "Real Madrid", "2023/24"],
+    ]
+
+
+def test_emparejar_clubes_drops_tied_votes():
+    pares = pd.DataFrame({"tm_player_id": [1, 2], "fbref_player_id": ["a", "b"]})
+    df_tm = pd.DataFrame(
+        {"tm_player_id": [1, 2], "tm_club_id": [368, 418], "club": ["S", "R"]}
+    )
+    df_fbref = pd.DataFrame(
+        {"fbref_player_id": ["a", "b"], "fbref_squad_id": ["53a2f082"] * 2}
+    )
+    assert emparejar_clubes(pares, df_tm, df_fbref, "2023/24").empty
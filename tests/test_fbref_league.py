@@ -0,0 +1,191 @@
+"""
+Tests for the league-wide FBref mode in ``scraper_fbref.py``.
+
+FBref's competition pages list every player of the league with a
+``Squad`` column instead of one page per team.  ``merge_tablas_liga``
+must combine those tables by player and squad and return the same
+schema produced by the per-team mode.  The tables are built in memory
+so no network access is required.
+"""
+
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+import transfer_genius.etl.scraper_fbref as scraper_fbref
+from transfer_genius.etl.scraper_fbref import (
+    leer_tablas_fbref,
+    merge_tablas_liga,
+    scrape_fbref,
+)
+
+
+def _tabla(columnas: list[tuple[str, str]], filas: list[list]) -> pd.DataFrame:
+    return pd.DataFrame(filas, columns=pd.MultiIndex.from_tuples(columnas))
+
+
+def test_merge_tablas_liga_uses_squad_as_team():
+    """Players are matched by name and squad, and ``Squad`` becomes ``Team``."""
+    base = [
+        ("Unnamed: 0_level_0", "Rk"),
+        ("Unnamed: 1_level_0", "Player"),
+        ("Unnamed: 2_level_0", "Squad"),
+        ("Unnamed: 3_level_0", "Age"),
+        ("Unnamed: 4_level_0", "Born"),
+    ]
+    standard = _tabla(
+        base + [("Performance", "Gls"), ("Unnamed: 6_level_0", "Matches")],
+        [
+            [1, "Ana", "Betis", "24-100", 2000, 3, "Matches"],
+            [2, "Ana", "Elche", "24-100", 2000, 1, "Matches"],
+            ["Rk", "Player", "Squad", "Age", "Born", "Gls", "Matches"],
+            [3, "Bea", "Betis", "30-001", 1994, 0, "Matches"],
+        ],
+    )
+    shooting = _tabla(
+        base + [("Standard", "Sh")],
+        [
+            [1, "Ana", "Betis", "24-100", 2000, 10],
+            [2, "Ana", "Elche", "24-100", 2000, 4],
+            [3, "Bea", "Betis", "30-001", 1994, 2],
+        ],
+    )
+
+    df = merge_tablas_liga([standard, shooting])
+
+    assert list(df.columns) == [
+        "Player",
+        "Age",
+        "Performance_Gls",
+        "Standard_Sh",
+        "Team",
+    ]
+    assert len(df) == 3
+    ana_elche = df[(df["Player"] == "Ana") & (df["Team"] == "Elche")].iloc[0]
+    assert ana_elche["Standard_Sh"] == 4
+    assert ana_elche["Age"] == 24
+
+
+def test_leer_tablas_fbref_extracts_player_and_squad_ids():
+    """Player and squad links are turned into ``fbref_*_id`` columns."""
+    html = """
+    <table id="stats_standard">
+      <thead>
+        <tr><th></th><th></th><th>Playing Time</th></tr>
+        <tr><th>Player</th><th>Squad</th><th>Min</th></tr>
+      </thead>
+      <tbody>
+        <tr><td><a href="/en/players/1f44ac21/Ana">Ana</a></td>
+            <td><a href="/en/squads/fc536746/Betis-Stats">Betis</a></td>
+            <td>1,234</td></tr>
+        <tr><td>Player</td><td>Squad</td><td>Min</td></tr>
+      </tbody>
+    </table>
+    """
+    df = leer_tablas_fbref(html, attrs={"id": "stats_standard"})[0]
+
+    assert df.loc[0, "Player"] == "Ana"
+    assert df.loc[0, "fbref_player_id"] == "1f44ac21"
+    assert df.loc[0, "fbref_squad_id"] == "fc536746"
+    assert pd.isna(df.loc[1, "fbref_player_id"])
+    # The repeated header row keeps ``Min`` as text, without the thousands ","
+    assert df.loc[0, "Playing Time_Min"] == "1234"
+
+
+def test_leer_tablas_fbref_infers_numeric_columns():
+    """Cell text gets the same types a plain ``pd.read_html`` would give."""
+    html = """
+    <table>
+      <thead>
+        <tr><th></th><th>Playing Time</th><th>Performance</th><th></th></tr>
+        <tr><th>Player</th><th>Min</th><th>Gls</th><th>Age</th></tr>
+      </thead>
+      <tbody>
+        <tr><td>Ana</td><td>1,234</td><td>2</td><td>24-100</td></tr>
+        <tr><td>Bea</td><td>90</td><td></td><td>30-001</td></tr>
+      </tbody>
+    </table>
+    """
+    df = leer_tablas_fbref(html)[0]
+    assert df["Playing Time_Min"].tolist() == [1234, 90]
+    assert str(df["Playing Time_Min"].dtype) == "int64"
+    assert df["Performance_Gls"].iloc[0] == 2
+    assert pd.isna(df["Performance_Gls"].iloc[1])
+    assert df["Age"].tolist() == ["24-100", "30-001"]
+
+
+def test_scrape_fbref_league_mode_writes_season_csv(tmp_path, monkeypatch):
+    """``scrape_fbref`` dispatches to the league pages and writes the CSV."""
+    standard = _tabla(
+        [
+            ("Unnamed: 0_level_0", "Player"),
+            ("Unnamed: 1_level_0", "Squad"),
+            ("Performance", "Gls"),
+        ],
+        [["Ana", "Betis", 3]],
+    )
+    llamadas = []
+
+    def fake_extraer(season_label):
+        llamadas.append(season_label)
+        return [standard.copy()]
+
+    monkeypatch.setattr(scraper_fbref, "OUTPUT_DIR", tmp_path)
+    monkeypatch.setattr(scraper_fbref, "extraer_tablas_liga", fake_extraer)
+    monkeypatch.setattr(scraper_fbref.time, "sleep", lambda _: None)
+
+    scrape_fbref([2018], mode="league")
+
+    assert llamadas == ["2018-2019"]
+    df = pd.read_csv(tmp_path / "fbref_laliga_2018.csv")
+    assert df[["Player", "Team", "Season"]].values.tolist() == [
+        ["Ana", "Betis", "2018-2019"]
+    ]
+
+
+def test_scrape_fbref_rejects_unknown_mode():
+    with pytest.raises(ValueError):
+        scrape_fbref([2018], mode="players")
+
+
+def test_normalizar_esquema_matches_between_modes():
+    """Team pages show ``Age`` as "years-days" too; both modes write integers."""
+    equipo = pd.DataFrame(
+        {"Player": ["Ana"], "Age": ["24-100"], "Team": ["Betis"], "Gls": [3]}
+    )
+    df = scraper_fbref.normalizar_esquema(equipo)
+    assert str(df["Age"].dtype) == "Int64"
+    assert df["Age"].iloc[0] == 24
+    assert list(df.columns) == ["Player", "Age", "Gls", "Team"]
+
+
+def test_merge_tablas_liga_joins_on_fbref_ids():
+    """Two players with the same name and squad stay apart when ids are present."""
+    base = [
+        ("Unnamed: 0_level_0", "Player"),
+        ("Unnamed: 1_level_0", "Squad"),
+        ("Unnamed: 2_level_0", "fbref_player_id"),
+        ("Unnamed: 3_level_0", "fbref_squad_id"),
+    ]
+    standard = _tabla(
+        base + [("Performance", "Gls")],
+        [
+            ["Raúl", "Betis", "aaaa1111", "fc536746", 3],
+            ["Raúl", "Betis", "bbbb2222", "fc536746", 1],
+        ],
+    )
+    shooting = _tabla(
+        base + [("Standard", "Sh")],
+        [
+            ["Raúl", "Betis", "bbbb2222", "fc536746", 4],
+            ["Raúl", "Betis", "aaaa1111", "fc536746", 9],
+        ],
+    )
+
+    df = merge_tablas_liga([standard, shooting])
+
+    assert len(df) == 2
+    por_id = df.set_index("fbref_player_id")
+    assert por_id.loc["aaaa1111", "Standard_Sh"] == 9
+    assert por_id.loc["bbbb2222", "Performance_Gls"] == 1
@@ -0,0 +1,80 @@
+"""
+Tests for the shared normalisation helpers in
+``transfer_genius/utils/normalization.py``.
+
+Both Transfermarkt scrapers and the FBref scraper rely on these helpers,
+so every suffix variant of a market value and every age format seen on
+the sites must parse to the same typed values.
+"""
+
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+from transfer_genius.utils.normalization import (
+    join_nationalities,
+    normalize_market_value,
+    parse_age,
+    parse_birth_date_age,
+    parse_market_value,
+)
+
+
+@pytest.mark.parametrize(
+    "raw,expected",
+    [
+        ("€1.50m", 1_500_000.0),
+        ("€500k", 500_000.0),
+        ("€500Th.", 500_000.0),
+        ("€1.20bn", 1_200_000_000.0),
+        ("1,50 Mio. €", 1_500_000.0),
+        ("750 Tsd. €", 750_000.0),
+        ("€900", 900.0),
+        ("-", 0.0),
+    ],
+)
+def test_parse_market_value_handles_all_suffixes(raw: str, expected: float) -> None:
+    assert parse_market_value(pd.Series([raw])).iloc[0] == expected
+
+
+def test_parse_market_value_marks_garbage_as_missing() -> None:
+    """Unparseable values must not be silently turned into zero."""
+    parsed = parse_market_value(pd.Series(["unknown", None]))
+    assert parsed.isna().all()
+
+
+def test_normalize_market_value_adds_euros_and_millions() -> None:
+    df = normalize_market_value(pd.DataFrame({"market_value": ["€25.00m", "€300k"]}))
+    assert df["market_value_eur"].tolist() == [25_000_000.0, 300_000.0]
+    assert df["mv_millions"].tolist() == [25.0, 0.3]
+
+
+def test_parse_age_accepts_transfermarkt_and_fbref_formats() -> None:
+    ages = parse_age(pd.Series(["36", "(36)", "24-100", 19, None]))
+    assert str(ages.dtype) == "Int64"
+    assert ages.tolist()[:4] == [36, 36, 24, 19]
+    assert ages.isna().iloc[4]
+
+
+def test_parse_birth_date_age_splits_cell() -> None:
+    parsed = parse_birth_date_age(
+        pd.Series(["Jun 24, 1987 (36)", "24/06/1987 (36)", "-"])
+    )
+    assert parsed["birth_date"].iloc[0] == pd.Timestamp("1987-06-24")
+    assert parsed["birth_date"].iloc[1] == pd.Timestamp("1987-06-24")
+    assert parsed["age"].tolist()[:2] == [36, 36]
+    assert parsed.iloc[2].isna().all()
+
+
+def test_parse_birth_date_age_keeps_date_without_age() -> None:
+    parsed = parse_birth_date_age(pd.Series(["Jun 24, 1987", "(36)"]))
+    assert parsed["birth_date"].iloc[0] == pd.Timestamp("1987-06-24")
+    assert pd.isna(parsed["age"].iloc[0])
+    assert pd.isna(parsed["birth_date"].iloc[1])
+    assert parsed["age"].iloc[1] == 36
+
+
+def test_join_nationalities_is_compact() -> None:
+    joined = join_nationalities(pd.Series([["Spain", "France"], ["Brazil"], []]))
+    assert joined.tolist() == ["Spain|France", "Brazil", ""]
@@ -0,0 +1,114 @@
+"""
+Tests for the bulk re-parse command in ``transfer_genius/etl/reparse.py``.
+
+The command must find the Transfermarkt squad pages cached by
+``scrape_transfermarkt`` and recover each club's real name from the
+season's ``clubs.html``.  These tests build a small fake cache in a
+temporary directory, so no network access is needed.
+"""
+
+from __future__ import annotations
+
+import pathlib
+
+import pandas as pd
+import pytest
+
+from transfer_genius.etl.changelog import leer_cambios
+from transfer_genius.etl.reparse import listar_tareas_transfermarkt, reparse
+from transfer_genius.etl.scraper_transfermarkt import club_filename
+
+CLUBS_HTML = """
+<html><body><table class="items"><tbody>
+<tr><td class="hauptlink">
+<a title="Real Madrid" href="/real-madrid/startseite/verein/418">RM</a>
+</td></tr>
+<tr><td class="hauptlink">
+<a title="Sevilla FC" href="/fc-sevilla/startseite/verein/368">SFC</a>
+</td></tr>
+</tbody></table></body></html>
+"""
+
+# Squad page with the layout ``parse_club_table`` expects: one outer row per
+# player whose name and position live in a nested inline table.
+SQUAD_HTML = """
+<html><head><meta charset="utf-8"></head><body>
+<table><tr><td>header</td></tr></table>
+<table class="items">
+<thead><tr>
+<th>#</th><th>Player</th><th>Date of birth/Age</th><th>Nat.</th><th>Market value</th>
+</tr></thead>
+<tbody><tr>
+<td>1</td>
+<td><table class="inline-table">
+<tr><td rowspan="2"></td>
+<td class="hauptlink"><a href="/ana/profil/spieler/123">Ana</a></td></tr>
+<tr><td>Goalkeeper</td></tr>
+</table></td>
+<td>Jun 24, 1987 (36)</td>
+<td><img title="Spain"></td>
+<td>€1.50m</td>
+</tr></tbody></table>
+</body></html>
+"""
+
+
+def test_listar_tareas_transfermarkt_uses_cached_pages(tmp_path: pathlib.Path) -> None:
+    """Only clubs whose squad page is cached produce a task, in club order."""
+    season_dir = tmp_path / "tm_laliga_2023"
+    season_dir.mkdir()
+    (season_dir / "clubs.html").write_text(CLUBS_HTML)
+    (season_dir / club_filename("Sevilla FC")).write_text("<html></html>")
+
+    tareas = listar_tareas_transfermarkt([2022, 2023], raw_dir=tmp_path)
+
+    assert tareas == [
+        (
+            "transfermarkt",
+            2023,
+            str(season_dir / "plantilla_sevilla_fc.html"),
+            "Sevilla FC",
+            368,
+        )
+    ]
+
+
+def test_reparse_writes_season_csv_and_marks_changelog(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Pages parsed in worker processes end up in the season CSV.
+
+    A broken page is skipped, and the correction against the previous CSV
+    is logged with ``origin == "reparse"``.
+    """
+    monkeypatch.chdir(tmp_path)
+    season_dir = pathlib.Path("data/raw/tm_laliga_2023")
+    season_dir.mkdir(parents=True)
+    (season_dir / "clubs.html").write_text(CLUBS_HTML)
+    (season_dir / club_filename("Sevilla FC")).write_text(SQUAD_HTML, encoding="utf-8")
+    (season_dir / club_filename("Real Madrid")).write_text("<html></html>")
+    interim = pathlib.Path("data/interim")
+    interim.mkdir(parents=True)
+    # Previous CSV written before the parser fix: no market value parsed
+    pd.DataFrame(
+        {
+            "player": ["Ana"],
+            "market_value_eur": [0.0],
+            "tm_player_id": [123],
+            "season": ["2023/24"],
+            "tm_club_id": [368],
+        }
+    ).to_csv(interim / "jugadores_laliga_2023.csv", index=False)
+
+    reparse([2023], workers=2)
+
+    df = pd.read_csv(interim / "jugadores_laliga_2023.csv")
+    assert df[
+        ["player", "club", "tm_player_id", "tm_club_id", "season"]
+    ].values.tolist() == [["Ana", "Sevilla FC", 123, 368, "2023/24"]]
+    assert df.loc[0, "market_value_eur"] == 1_500_000
+    assert leer_cambios("transfermarkt", 2023).empty
+    cambios = leer_cambios("transfermarkt", 2023, origen=None)
+    assert cambios[["origin", "change_type", "field"]].values.tolist() == [
+        ["reparse", "update", "market_value_eur"]
+    ]
@@ -0,0 +1 @@
+"""Benchmarks de rendimiento del pipeline (no se ejecutan en CI)."""
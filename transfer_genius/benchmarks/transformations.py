@@ -0,0 +1,308 @@
+"""Benchmark de escalado de las transformaciones de pandas del pipeline.
+
+Genera datos sintéticos con la forma de las tablas de FBref (cabecera de
+dos niveles, filas de cabecera repetidas) y de los CSV de Transfermarkt
+para varios tamaños (número de ligas × temporadas), mide el tiempo y la
+memoria de pico de cada etapa y guarda un informe JSON con las curvas de
+escalado.  El proceso termina con código 1 cuando alguna etapa empeora
+respecto al baseline versionado en ``configs/bench_baseline.json``
+(exponentes de escalado y memoria de pico, que no dependen de la
+máquina) o cuando ese baseline no existe.
+
+Uso::
+
+    python -m transfer_genius.benchmarks.transformations --leagues 1 5 20 --seasons 3
+    python -m transfer_genius.benchmarks.transformations --update-baseline
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import pathlib
+import resource
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from transfer_genius.etl.scraper_fbref import limpiar_tabla, merge_controlado_por_player
+from transfer_genius.etl.scraper_transfermarkt import season_label
+from transfer_genius.utils.normalization import parse_market_value
+
+REPORT_PATH = pathlib.Path("data/benchmarks/transformations.json")
+BASELINE_PATH = pathlib.Path("configs/bench_baseline.json")
+
+EQUIPOS_POR_LIGA = 20
+JUGADORES_POR_EQUIPO = 25
+# Número de tablas y columnas de estadísticas por tabla, como en FBref
+TABLAS_FBREF = 10
+COLUMNAS_POR_TABLA = 20
+FORMATOS_VALOR = ["€{:.2f}m", "€{:.0f}k", "€{:.0f}Th.", "-"]
+
+
+def generar_tablas_fbref(
+    n_ligas: int, n_temporadas: int, seed: int = 0
+) -> List[pd.DataFrame]:
+    """Tablas de jugadores estilo FBref para ``n_ligas × n_temporadas``.
+
+    Cada tabla comparte las columnas de identificación (``Player``,
+    ``Squad``, ``Nation``, ``Pos``, ``Age``) y añade su propio bloque de
+    estadísticas; cada 25 filas se repite la cabecera, como en FBref.
+    """
+    rng = np.random.default_rng(seed)
+    n = n_ligas * n_temporadas * EQUIPOS_POR_LIGA * JUGADORES_POR_EQUIPO
+    jugadores = np.array([f"Jugador {i}" for i in range(n)], dtype=object)
+    equipos = np.array(
+        [f"Equipo {i // JUGADORES_POR_EQUIPO}" for i in range(n)], dtype=object
+    )
+    ident = {
+        ("Unnamed: 0_level_0", "Player"): jugadores,
+        ("Unnamed: 1_level_0", "Squad"): equipos,
+        ("Unnamed: 2_level_0", "Nation"): rng.choice(["es ESP", "fr FRA", "br BRA"], n),
+        ("Unnamed: 3_level_0", "Pos"): rng.choice(["GK", "DF", "MF", "FW"], n),
+        ("Unnamed: 4_level_0", "Age"): rng.integers(17, 38, n),
+    }
+    cabecera = {col: col[1] for col in ident}
+    tablas = []
+    for t in range(TABLAS_FBREF):
+        datos = dict(ident)
+        for j in range(COLUMNAS_POR_TABLA):
+            datos[(f"Grupo{t}", f"Stat{j}")] = rng.random(n).round(2)
+            cabecera[(f"Grupo{t}", f"Stat{j}")] = f"Stat{j}"
+        datos[("Unnamed: 99_level_0", "Matches")] = "Matches"
+        cabecera[("Unnamed: 99_level_0", "Matches")] = "Matches"
+        df = pd.DataFrame(datos)
+        repetidas = pd.DataFrame([cabecera] * (n // 25), columns=df.columns)
+        df = pd.concat([df, repetidas], ignore_index=True)
+        tablas.append(df)
+    return tablas
+
+
+def generar_clubes_tm(
+    n_ligas: int, n_temporadas: int, seed: int = 0
+) -> List[pd.DataFrame]:
+    """Un DataFrame estilo ``parse_club_table`` por club y temporada."""
+    rng = np.random.default_rng(seed)
+    clubes = []
+    for c in range(n_ligas * n_temporadas * EQUIPOS_POR_LIGA):
+        valores = rng.random(JUGADORES_POR_EQUIPO) * 100
+        formatos = rng.choice(FORMATOS_VALOR, JUGADORES_POR_EQUIPO)
+        clubes.append(
+            pd.DataFrame(
+                {
+                    "player": [f"Jugador {c}_{i}" for i in range(JUGADORES_POR_EQUIPO)],
+                    "position": rng.choice(
+                        ["Goalkeeper", "Centre-Back", "Central Midfield"],
+                        JUGADORES_POR_EQUIPO,
+                    ),
+                    "age": rng.integers(17, 38, JUGADORES_POR_EQUIPO),
+                    "market_value": [
+                        f.format(v) for f, v in zip(formatos, valores, strict=True)
+                    ],
+                    "club": f"Club {c}",
+                    "season": season_label(2000 + c % n_temporadas),
+                }
+            )
+        )
+    return clubes
+
+
+def _medir(funcion: Callable[[], Any], repeticiones: int = 3) -> Dict[str, float]:
+    """Mejor tiempo de ``repeticiones`` ejecuciones y memoria de pico de otra aparte.
+
+    La memoria se mide en una ejecución separada porque ``tracemalloc``
+    ralentiza el código que observa.  Los mensajes de progreso de las
+    funciones del pipeline se descartan.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        tiempos = []
+        for _ in range(repeticiones):
+            t0 = time.perf_counter()
+            funcion()
+            tiempos.append(time.perf_counter() - t0)
+        tracemalloc.start()
+        funcion()
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return {"seconds": min(tiempos), "peak_mb": pico / 1024**2}
+
+
+def medir_etapas(n_ligas: int, n_temporadas: int) -> Dict[str, Dict[str, float]]:
+    """Tiempo y memoria de pico de cada etapa para un tamaño dado."""
+    tablas = generar_tablas_fbref(n_ligas, n_temporadas)
+    clubes = generar_clubes_tm(n_ligas, n_temporadas)
+    valores = pd.concat(clubes, ignore_index=True)["market_value"]
+
+    etapas = {
+        "limpiar_tabla": _medir(lambda: [limpiar_tabla(df.copy()) for df in tablas]),
+        "merge_controlado_por_player": _medir(
+            lambda: merge_controlado_por_player(
+                [df.copy() for df in tablas], claves=["Player", "Squad"]
+            )
+        ),
+        "parse_market_value": _medir(lambda: parse_market_value(valores)),
+        "concat_temporadas": _medir(lambda: pd.concat(clubes, ignore_index=True)),
+    }
+    filas = n_ligas * n_temporadas * EQUIPOS_POR_LIGA * JUGADORES_POR_EQUIPO
+    for resultado in etapas.values():
+        resultado["rows"] = filas
+    return etapas
+
+
+def exponente_escalado(filas: List[float], segundos: List[float]) -> float | None:
+    """Pendiente de log(tiempo) frente a log(filas); ~1 es lineal."""
+    if len(filas) < 2:
+        return None
+    pendiente, _ = np.polyfit(np.log(filas), np.log(np.maximum(segundos, 1e-9)), 1)
+    return float(pendiente)
+
+
+def ejecutar(ligas: List[int], temporadas: int) -> Dict[str, Any]:
+    """Ejecutar todas las etapas para cada tamaño y construir el informe."""
+    informe: Dict[str, Any] = {"leagues": ligas, "seasons": temporadas, "stages": {}}
+    for n_ligas in ligas:
+        print(f"⏱️  {n_ligas} liga(s) × {temporadas} temporada(s)")
+        for etapa, resultado in medir_etapas(n_ligas, temporadas).items():
+            print(
+                f"   {etapa}: {resultado['seconds']:.3f}s, "
+                f"pico {resultado['peak_mb']:.1f} MB"
+            )
+            informe["stages"].setdefault(etapa, {"points": []})["points"].append(
+                {"leagues": n_ligas, **resultado}
+            )
+    for datos in informe["stages"].values():
+        puntos = datos["points"]
+        datos["scaling_exponent"] = exponente_escalado(
+            [p["rows"] for p in puntos], [p["seconds"] for p in puntos]
+        )
+    # ru_maxrss está en KB en Linux
+    informe["max_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return informe
+
+
+def baseline_portable(
+    informe: Dict[str, Any], con_tiempos: bool = False
+) -> Dict[str, Any]:
+    """Reducir un informe a lo que no depende de la máquina.
+
+    Se guardan el exponente de escalado y la memoria de pico de cada
+    punto; los tiempos absolutos sólo se incluyen con ``con_tiempos``
+    (baseline local de una máquina concreta).
+    """
+    campos = ["leagues", "rows", "peak_mb"] + (["seconds"] if con_tiempos else [])
+    return {
+        "leagues": informe["leagues"],
+        "seasons": informe["seasons"],
+        "stages": {
+            etapa: {
+                "points": [{c: p[c] for c in campos} for p in datos["points"]],
+                "scaling_exponent": datos["scaling_exponent"],
+            }
+            for etapa, datos in informe["stages"].items()
+        },
+    }
+
+
+def comparar_con_baseline(
+    informe: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerancia_tiempo: float = 0.5,
+    tolerancia_exponente: float = 0.25,
+    tolerancia_memoria: float = 0.25,
+    margen_memoria_mb: float = 1.0,
+) -> List[str]:
+    """Devolver la lista de regresiones respecto al baseline.
+
+    Una etapa empeora si su exponente de escalado crece más de
+    ``tolerancia_exponente`` o si, para un mismo número de filas, su
+    memoria de pico supera en más de ``tolerancia_memoria`` (y de
+    ``margen_memoria_mb``) la guardada.  Los tiempos absolutos sólo se
+    comparan, con ``tolerancia_tiempo``, si el baseline los incluye.
+    """
+    regresiones = []
+    for etapa, datos in informe["stages"].items():
+        base = baseline.get("stages", {}).get(etapa)
+        if base is None:
+            continue
+        # Los puntos se emparejan por número de filas (ligas × temporadas)
+        base_puntos = {p["rows"]: p for p in base["points"]}
+        for punto in datos["points"]:
+            ref = base_puntos.get(punto["rows"])
+            if not ref:
+                continue
+            if "seconds" in ref and punto["seconds"] > ref["seconds"] * (
+                1 + tolerancia_tiempo
+            ):
+                regresiones.append(
+                    f"{etapa} ({punto['leagues']} ligas): "
+                    f"{punto['seconds']:.3f}s > {ref['seconds']:.3f}s"
+                )
+            limite = max(
+                ref["peak_mb"] * (1 + tolerancia_memoria),
+                ref["peak_mb"] + margen_memoria_mb,
+            )
+            if punto["peak_mb"] > limite:
+                regresiones.append(
+                    f"{etapa} ({punto['leagues']} ligas): "
+                    f"pico {punto['peak_mb']:.1f} MB > {ref['peak_mb']:.1f} MB"
+                )
+        exp, exp_base = datos.get("scaling_exponent"), base.get("scaling_exponent")
+        if (
+            exp is not None
+            and exp_base is not None
+            and exp > exp_base + tolerancia_exponente
+        ):
+            regresiones.append(f"{etapa}: exponente {exp:.2f} > {exp_base:.2f}")
+    return regresiones
+
+
+def main() -> None:
+    """Punto de entrada del benchmark (``make bench``)."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark de escalado de las transformaciones"
+    )
+    parser.add_argument("--leagues", type=int, nargs="+", default=[1, 5, 20])
+    parser.add_argument("--seasons", type=int, default=3)
+    parser.add_argument("--report", type=pathlib.Path, default=REPORT_PATH)
+    parser.add_argument("--baseline", type=pathlib.Path, default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument(
+        "--with-times",
+        action="store_true",
+        help="incluir tiempos absolutos en el baseline (sólo válido en esta máquina)",
+    )
+    args = parser.parse_args()
+
+    informe = ejecutar(args.leagues, args.seasons)
+    args.report.parent.mkdir(parents=True, exist_ok=True)
+    args.report.write_text(json.dumps(informe, indent=2))
+    print(f"💾 Informe guardado en {args.report}")
+
+    if args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(
+            json.dumps(baseline_portable(informe, args.with_times), indent=2)
+        )
+        print(f"📌 Baseline actualizado en {args.baseline}")
+        return
+    if not args.baseline.exists():
+        print(
+            f"❌ No hay baseline en {args.baseline}; usa --update-baseline para crearlo"
+        )
+        sys.exit(1)
+    regresiones = comparar_con_baseline(informe, json.loads(args.baseline.read_text()))
+    for regresion in regresiones:
+        print(f"❌ Regresión: {regresion}")
+    if regresiones:
+        sys.exit(1)
+    print("✅ Sin regresiones respecto al baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""Registro de cambios entre scrapes sucesivos (change-data-capture).
+
+Antes de sobrescribir ``data/interim/jugadores_laliga_<year>.csv`` se
+compara la nueva salida con la versión anterior, por jugador, temporada y
+club, y se añade al registro un fichero con las diferencias:
+
+* ``insert``: jugador nuevo en la plantilla.
+* ``delete``: jugador que ya no aparece.
+* ``transfer``: el mismo jugador pasa de un club a otro en la temporada.
+* ``update``: cambia algún campo de ``CAMPOS_TM`` (valor de mercado,
+  posición, ...); una fila por campo modificado.
+
+Cada entrada lleva un ``origin``: ``scrape`` para datos recién descargados
+y ``reparse`` cuando sólo se ha vuelto a parsear el HTML cacheado (por
+ejemplo, tras corregir un parser).  Las segundas reflejan correcciones,
+no cambios reales, y ``leer_cambios`` las excluye por defecto.
+
+El registro es de sólo escritura y está particionado por fuente y
+temporada (``data/changelog/<fuente>/season=<year>/<marca>.csv``), de
+modo que los pasos posteriores pueden procesar únicamente los ficheros
+nuevos en lugar de toda la temporada.
+"""
+
+from __future__ import annotations
+
+import pathlib
+from datetime import datetime, timezone
+from io import StringIO
+from typing import List
+
+import pandas as pd
+
+CHANGELOG_DIR = pathlib.Path("data/changelog")
+# Clave de cada fila: jugador + temporada + club
+CLAVES_TM = ["tm_player_id", "season", "tm_club_id"]
+# Campos cuyos cambios se registran.  El resto son derivados o estáticos:
+# ``age`` depende de la fecha del scrape (se sigue ``birth_date``) y ``club``
+# cambia junto con la clave ``tm_club_id`` (ya registrado como traspaso).
+CAMPOS_TM = ["market_value_eur", "position", "birth_date", "nationality"]
+COLUMNAS = ["change_type", *CLAVES_TM, "field", "old_value", "new_value"]
+
+
+def diff_snapshots(
+    anterior: pd.DataFrame,
+    nuevo: pd.DataFrame,
+    claves: List[str] = CLAVES_TM,
+    campos: List[str] = CAMPOS_TM,
+) -> pd.DataFrame:
+    """Comparar dos versiones de un CSV y devolver los cambios en formato largo.
+
+    Ambos DataFrames deben tener los tipos con los que se leen desde CSV
+    (ver ``registrar_cambios``) para que valores iguales se comparen como
+    iguales.  Las filas sin clave completa se ignoran.  Sólo se comparan
+    los ``campos`` seguidos; las columnas derivadas (``mv_millions``,
+    ``market_value``, ``player_url``, ...) no generan cambios propios.
+
+    Returns
+    -------
+    pd.DataFrame
+        Columnas ``change_type``, las claves, ``field``, ``old_value`` y
+        ``new_value``; los valores se guardan como texto.
+    """
+    anterior = _claves_enteras(
+        anterior.dropna(subset=claves).drop_duplicates(claves, keep="last"), claves
+    )
+    nuevo = _claves_enteras(
+        nuevo.dropna(subset=claves).drop_duplicates(claves, keep="last"), claves
+    )
+    campos = [c for c in campos if c in anterior.columns and c in nuevo.columns]
+
+    unido = anterior.merge(
+        nuevo, on=claves, how="outer", suffixes=("_old", "_new"), indicator=True
+    )
+    cambios = []
+
+    altas = unido[unido["_merge"] == "right_only"][claves]
+    bajas = unido[unido["_merge"] == "left_only"][claves]
+    # Pares (versión anterior, versión nueva) cuyos campos se comparan
+    pares = [unido[unido["_merge"] == "both"]]
+    # Un jugador que sale de un club y entra en otro en la misma temporada
+    # es un traspaso, no una baja más un alta
+    entidad, club = claves[:-1], claves[-1]
+    traspasos = bajas.merge(altas, on=entidad, suffixes=("_old", "_new"))
+    if not traspasos.empty:
+        cambios.append(
+            traspasos.assign(
+                change_type="transfer",
+                field=club,
+                old_value=traspasos[f"{club}_old"].astype("string"),
+                new_value=traspasos[f"{club}_new"].astype("string"),
+                **{club: traspasos[f"{club}_new"]},
+            )
+        )
+        # Los cambios de valor o posición durante el traspaso también cuentan
+        filas = traspasos.merge(
+            anterior.rename(columns={club: f"{club}_old"}), on=[*entidad, f"{club}_old"]
+        ).merge(
+            nuevo.rename(columns={club: f"{club}_new"}),
+            on=[*entidad, f"{club}_new"],
+            suffixes=("_old", "_new"),
+        )
+        pares.append(filas.assign(**{club: filas[f"{club}_new"]}))
+        movidos = traspasos[entidad]
+        altas = altas.merge(movidos, on=entidad, how="left", indicator=True)
+        altas = altas[altas.pop("_merge") == "left_only"]
+        bajas = bajas.merge(movidos, on=entidad, how="left", indicator=True)
+        bajas = bajas[bajas.pop("_merge") == "left_only"]
+    cambios.append(altas.assign(change_type="insert"))
+    cambios.append(bajas.assign(change_type="delete"))
+
+    columnas_pares = claves + [f"{c}_{v}" for c in campos for v in ("old", "new")]
+    comunes = pd.concat([p[columnas_pares] for p in pares], ignore_index=True)
+    for campo in campos:
+        viejo, nuevo_valor = comunes[f"{campo}_old"], comunes[f"{campo}_new"]
+        if not (
+            pd.api.types.is_numeric_dtype(viejo)
+            and pd.api.types.is_numeric_dtype(nuevo_valor)
+        ):
+            viejo, nuevo_valor = viejo.astype("string"), nuevo_valor.astype("string")
+        # Se compara por valor (36 == 36.0) y dos vacíos cuentan como iguales
+        distinto = (viejo != nuevo_valor) & ~(viejo.isna() & nuevo_valor.isna())
+        distinto = distinto.fillna(True).astype(bool)
+        if distinto.any():
+            viejo, nuevo_valor = viejo.astype("string"), nuevo_valor.astype("string")
+            cambios.append(
+                comunes.loc[distinto, claves].assign(
+                    change_type="update",
+                    field=campo,
+                    old_value=viejo[distinto],
+                    new_value=nuevo_valor[distinto],
+                )
+            )
+
+    resultado = pd.concat(cambios, ignore_index=True)
+    return resultado.reindex(columns=COLUMNAS)
+
+
+def _claves_enteras(df: pd.DataFrame, claves: List[str]) -> pd.DataFrame:
+    """Devolver a ``Int64`` las claves que ``read_csv`` lee como float por huecos."""
+    df = df.copy()
+    for col in claves:
+        if pd.api.types.is_float_dtype(df[col]):
+            df[col] = df[col].astype("Int64")
+    return df
+
+
+def _como_csv(df: pd.DataFrame) -> pd.DataFrame:
+    """Pasar ``df`` por CSV para tener los mismos tipos que la versión anterior."""
+    return pd.read_csv(StringIO(df.to_csv(index=False)))
+
+
+def registrar_cambios(
+    out_csv: pathlib.Path,
+    df_nuevo: pd.DataFrame,
+    fuente: str,
+    temporada: int,
+    origen: str = "scrape",
+    log_dir: pathlib.Path = CHANGELOG_DIR,
+) -> pd.DataFrame | None:
+    """Comparar ``df_nuevo`` con ``out_csv`` (si existe) y registrar los cambios.
+
+    Debe llamarse antes de sobrescribir ``out_csv``.  Devuelve los cambios
+    registrados o ``None`` si no había versión anterior o si alguna de las
+    dos versiones no tiene las claves (``CLAVES_TM``) para compararlas.
+    """
+    if not out_csv.exists():
+        return None
+    anterior = pd.read_csv(out_csv)
+    if any(c not in anterior.columns for c in CLAVES_TM):
+        print(f"⚠️ {out_csv.name} no tiene ids; no se registran cambios")
+        return None
+    if any(c not in df_nuevo.columns for c in CLAVES_TM):
+        print(f"⚠️ La nueva versión de {out_csv.name} no tiene ids; no se registran")
+        return None
+    cambios = diff_snapshots(anterior, _como_csv(df_nuevo))
+    if cambios.empty:
+        print(f"🟰 Sin cambios en {out_csv.name}")
+        return cambios
+    marca = datetime.now(timezone.utc)
+    # Misma precisión que el nombre del fichero, para usarla como cursor
+    cambios.insert(0, "detected_at", marca.isoformat(timespec="microseconds"))
+    cambios.insert(1, "origin", origen)
+    particion = log_dir / fuente / f"season={temporada}"
+    particion.mkdir(parents=True, exist_ok=True)
+    destino = particion / f"{marca:%Y%m%dT%H%M%S%f}.csv"
+    cambios.to_csv(destino, index=False)
+    resumen = cambios["change_type"].value_counts().to_dict()
+    print(f"📝 Cambios en {out_csv.name} → {destino} {resumen}")
+    return cambios
+
+
+def leer_cambios(
+    fuente: str,
+    temporada: int | None = None,
+    desde: str | None = None,
+    origen: str | None = "scrape",
+    log_dir: pathlib.Path = CHANGELOG_DIR,
+) -> pd.DataFrame:
+    """Leer el registro de una fuente, opcionalmente filtrado por temporada y fecha.
+
+    ``desde`` es una marca ISO (``detected_at``); sólo se devuelven los
+    cambios detectados después de ella, para consumir únicamente deltas.
+    Como ``detected_at`` tiene precisión de microsegundos, el último valor
+    leído sirve de cursor para la siguiente lectura.
+    Por defecto sólo se devuelven cambios de ``origin == "scrape"``; con
+    ``origen=None`` se incluyen también los de ``reparse``.
+    """
+    patron = f"season={temporada}/*.csv" if temporada is not None else "season=*/*.csv"
+    ficheros = sorted((log_dir / fuente).glob(patron))
+    if not ficheros:
+        return pd.DataFrame(columns=["detected_at", "origin", *COLUMNAS])
+    cambios = pd.concat([pd.read_csv(f) for f in ficheros], ignore_index=True)
+    if "origin" not in cambios.columns:
+        cambios.insert(1, "origin", "scrape")
+    cambios["origin"] = cambios["origin"].fillna("scrape")
+    if origen is not None:
+        cambios = cambios[cambios["origin"] == origen]
+    if desde is not None:
+        cambios = cambios[cambios["detected_at"] > desde]
+    return cambios.sort_values("detected_at", kind="stable").reset_index(drop=True)
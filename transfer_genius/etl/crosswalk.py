@@ -0,0 +1,259 @@
+"""Tablas de correspondencia entre los ids de Transfermarkt y FBref.
+
+Los scrapers guardan ``tm_player_id`` y ``tm_club_id`` (Transfermarkt) y
+``fbref_player_id`` y ``fbref_squad_id`` (FBref) junto a cada jugador.
+Este módulo empareja los jugadores de ambas fuentes temporada a temporada
+y, a partir de esos pares, los clubes.  Ambas tablas se acumulan en
+``data/processed/crosswalk_players.csv`` y
+``data/processed/crosswalk_clubs.csv``, de forma que los merges
+posteriores puedan unir por clave en lugar de comparar nombres.
+
+El emparejamiento de jugadores sólo usa el nombre normalizado y la edad
+(con una tolerancia de un año, porque cada fuente calcula la edad en una
+fecha distinta) y descarta cualquier nombre ambiguo.  Un club se empareja
+con el equipo de FBref en el que juegan más de sus jugadores emparejados,
+siempre que la relación sea mutua.  Una vez que un id entra en una tabla
+no se vuelve a reasignar.
+"""
+
+from __future__ import annotations
+
+import pathlib
+import unicodedata
+from typing import List, Tuple
+
+import pandas as pd
+
+from transfer_genius.etl.scraper_transfermarkt import season_label
+from transfer_genius.utils.config import load_config
+
+INTERIM_DIR = pathlib.Path("data/interim")
+CROSSWALK_PATH = pathlib.Path("data/processed/crosswalk_players.csv")
+CROSSWALK_CLUBS_PATH = pathlib.Path("data/processed/crosswalk_clubs.csv")
+COLUMNAS = ["tm_player_id", "fbref_player_id", "player", "season"]
+COLUMNAS_CLUBES = ["tm_club_id", "fbref_squad_id", "club", "season"]
+# Par de ids (Transfermarkt, FBref) que identifica cada tabla
+CLAVES_JUGADORES = ("tm_player_id", "fbref_player_id")
+CLAVES_CLUBES = ("tm_club_id", "fbref_squad_id")
+
+
+def normalizar_nombre(nombres: pd.Series) -> pd.Series:
+    """Quitar acentos, pasar a minúsculas y colapsar espacios."""
+    return (
+        nombres.astype("string")
+        .map(
+            lambda x: unicodedata.normalize("NFKD", x)
+            .encode("ascii", "ignore")
+            .decode(),
+            na_action="ignore",
+        )
+        .str.lower()
+        .str.split()
+        .str.join(" ")
+    )
+
+
+def emparejar_temporada(
+    df_tm: pd.DataFrame, df_fbref: pd.DataFrame, season: str
+) -> pd.DataFrame:
+    """Emparejar los jugadores de una temporada de ambas fuentes.
+
+    Parameters
+    ----------
+    df_tm: pd.DataFrame
+        CSV de Transfermarkt (``jugadores_laliga_<year>.csv``) con
+        ``player``, ``age`` y ``tm_player_id``.
+    df_fbref: pd.DataFrame
+        CSV de FBref (``fbref_laliga_<year>.csv``) con ``Player``, ``Age``
+        y ``fbref_player_id``.
+    season: str
+        Etiqueta de temporada guardada en la tabla.
+
+    Returns
+    -------
+    pd.DataFrame
+        Pares uno a uno con las columnas de ``COLUMNAS``.
+    """
+    tm = (
+        pd.DataFrame(
+            {
+                "tm_player_id": df_tm["tm_player_id"],
+                "player": df_tm["player"],
+                "nombre": normalizar_nombre(df_tm["player"]),
+                "edad_tm": pd.to_numeric(df_tm["age"], errors="coerce"),
+            }
+        )
+        .dropna(subset=["tm_player_id", "nombre"])
+        .drop_duplicates("tm_player_id")
+    )
+    fb = (
+        pd.DataFrame(
+            {
+                "fbref_player_id": df_fbref["fbref_player_id"],
+                "nombre": normalizar_nombre(df_fbref["Player"]),
+                "edad_fb": pd.to_numeric(df_fbref["Age"], errors="coerce"),
+            }
+        )
+        .dropna(subset=["fbref_player_id", "nombre"])
+        .drop_duplicates("fbref_player_id")
+    )
+
+    pares = tm.merge(fb, on="nombre", how="inner")
+    diferencia = (pares["edad_tm"] - pares["edad_fb"]).abs()
+    pares = pares[diferencia.isna() | (diferencia <= 1)]
+    # Descartar nombres ambiguos: cada id debe aparecer en un único par
+    pares = _sin_conflictos(pares, CLAVES_JUGADORES)
+    pares = pares.assign(season=season)
+    return pares[COLUMNAS].reset_index(drop=True)
+
+
+def emparejar_clubes(
+    pares: pd.DataFrame, df_tm: pd.DataFrame, df_fbref: pd.DataFrame, season: str
+) -> pd.DataFrame:
+    """Emparejar los clubes de una temporada a partir de los jugadores emparejados.
+
+    Cada club de Transfermarkt se asocia al equipo de FBref en el que
+    aparecen más de sus jugadores emparejados, y viceversa; sólo se
+    conservan las asociaciones en las que ambas direcciones coinciden.
+    Un empate en la votación se trata como un nombre ambiguo y se descarta.
+
+    Parameters
+    ----------
+    pares: pd.DataFrame
+        Salida de ``emparejar_temporada`` para la misma temporada.
+    df_tm: pd.DataFrame
+        CSV de Transfermarkt con ``tm_player_id``, ``tm_club_id`` y ``club``.
+    df_fbref: pd.DataFrame
+        CSV de FBref con ``fbref_player_id`` y ``fbref_squad_id``.
+    season: str
+        Etiqueta de temporada guardada en la tabla.
+
+    Returns
+    -------
+    pd.DataFrame
+        Pares uno a uno con las columnas de ``COLUMNAS_CLUBES``.
+    """
+    tm = df_tm[["tm_player_id", "tm_club_id", "club"]].dropna()
+    fb = df_fbref[["fbref_player_id", "fbref_squad_id"]].dropna().drop_duplicates()
+    # Un jugador traspasado en mitad de temporada aporta un voto por club
+    votos = (
+        pares[["tm_player_id", "fbref_player_id"]]
+        .merge(tm, on="tm_player_id")
+        .merge(fb, on="fbref_player_id")
+        .groupby(["tm_club_id", "club", "fbref_squad_id"], as_index=False)
+        .size()
+    )
+    mejor_fb = _mas_votado(votos, "fbref_squad_id")
+    clubes = _mas_votado(votos, "tm_club_id").merge(
+        mejor_fb[["tm_club_id", "fbref_squad_id"]]
+    )
+    clubes = clubes.astype({"tm_club_id": "Int64"}).assign(season=season)
+    return clubes[COLUMNAS_CLUBES].reset_index(drop=True)
+
+
+def _mas_votado(votos: pd.DataFrame, clave: str) -> pd.DataFrame:
+    """Quedarse, para cada ``clave``, con la fila más votada si no hay empate."""
+    maximos = votos[votos["size"] == votos.groupby(clave)["size"].transform("max")]
+    return maximos[~maximos[clave].duplicated(keep=False)]
+
+
+def _sin_conflictos(pares: pd.DataFrame, claves: Tuple[str, str]) -> pd.DataFrame:
+    """Descartar los pares cuyos ids aparecen emparejados más de una vez."""
+    return pares[
+        ~pares[claves[0]].duplicated(keep=False)
+        & ~pares[claves[1]].duplicated(keep=False)
+    ]
+
+
+def combinar_temporadas(
+    pares: pd.DataFrame, claves: Tuple[str, str] = CLAVES_JUGADORES
+) -> pd.DataFrame:
+    """Unir los pares de varias temporadas descartando los conflictos.
+
+    Un mismo par repetido en varias temporadas se conserva una vez (la
+    primera temporada).  Si un id aparece emparejado con ids distintos en
+    temporadas diferentes, se descartan todos sus pares, igual que con los
+    nombres ambiguos dentro de una temporada.
+    """
+    pares = pares.drop_duplicates(list(claves))
+    return _sin_conflictos(pares, claves).reset_index(drop=True)
+
+
+def cargar_crosswalk(
+    path: pathlib.Path = CROSSWALK_PATH,
+    claves: Tuple[str, str] = CLAVES_JUGADORES,
+    columnas: List[str] = COLUMNAS,
+) -> pd.DataFrame:
+    if path.exists():
+        return pd.read_csv(path, dtype={claves[0]: "Int64", claves[1]: "string"})
+    return pd.DataFrame(columns=columnas)
+
+
+def actualizar_crosswalk(
+    nuevos: pd.DataFrame,
+    path: pathlib.Path = CROSSWALK_PATH,
+    claves: Tuple[str, str] = CLAVES_JUGADORES,
+) -> pd.DataFrame:
+    """Añadir pares nuevos a la tabla persistida sin modificar los existentes."""
+    actual = cargar_crosswalk(path, claves, list(nuevos.columns))
+    nuevos = nuevos[
+        ~nuevos[claves[0]].isin(actual[claves[0]])
+        & ~nuevos[claves[1]].isin(actual[claves[1]])
+    ]
+    crosswalk = pd.concat([actual, nuevos], ignore_index=True)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    crosswalk.to_csv(path, index=False)
+    print(
+        f"🔗 Crosswalk actualizado → {path} "
+        f"({len(nuevos)} nuevos, {len(crosswalk)} total)"
+    )
+    return crosswalk
+
+
+def construir_crosswalk(
+    seasons: List[int],
+    interim_dir: pathlib.Path = INTERIM_DIR,
+    path: pathlib.Path = CROSSWALK_PATH,
+    path_clubes: pathlib.Path = CROSSWALK_CLUBS_PATH,
+) -> None:
+    """Emparejar las temporadas indicadas y actualizar las tablas persistidas."""
+    pares, clubes = [], []
+    for year in seasons:
+        tm_csv = interim_dir / f"jugadores_laliga_{year}.csv"
+        fbref_csv = interim_dir / f"fbref_laliga_{year}.csv"
+        if not (tm_csv.exists() and fbref_csv.exists()):
+            print(f"⏭️ Faltan CSV de {year}, se omite en el crosswalk")
+            continue
+        df_tm = pd.read_csv(tm_csv)
+        df_fbref = pd.read_csv(fbref_csv)
+        if (
+            "tm_player_id" not in df_tm.columns
+            or "fbref_player_id" not in df_fbref.columns
+        ):
+            print(f"⚠️ Los CSV de {year} no tienen ids; vuelve a generarlos")
+            continue
+        season = season_label(year)
+        pares.append(emparejar_temporada(df_tm, df_fbref, season))
+        if "tm_club_id" in df_tm.columns and "fbref_squad_id" in df_fbref.columns:
+            clubes.append(emparejar_clubes(pares[-1], df_tm, df_fbref, season))
+    if pares:
+        actualizar_crosswalk(
+            combinar_temporadas(pd.concat(pares, ignore_index=True)), path
+        )
+    if clubes:
+        actualizar_crosswalk(
+            combinar_temporadas(pd.concat(clubes, ignore_index=True), CLAVES_CLUBES),
+            path_clubes,
+            CLAVES_CLUBES,
+        )
+
+
+def main() -> None:
+    """Punto de entrada para ``python -m transfer_genius.etl.crosswalk``."""
+    config = load_config()
+    seasons = [int(s) for s in config.get("seasons", [])]
+    construir_crosswalk(seasons)
+
+
+if __name__ == "__main__":
+    main()
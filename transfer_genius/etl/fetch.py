@@ -14,6 +14,7 @@ from pathlib import Path
 from transfer_genius.utils.config import load_config
 from transfer_genius.etl.scraper_transfermarkt import scrape_transfermarkt
 from transfer_genius.etl.scraper_fbref import scrape_fbref
+from transfer_genius.etl.crosswalk import construir_crosswalk
 
 
 def main() -> None:
@@ -27,13 +28,16 @@ def main() -> None:
             if path.exists():
                 print(f"🗑️  Modo real: eliminando {path} para recargar datos...")
                 for child in path.rglob("*"):
-                    if child.is_file():
+                    # Los CSV de Transfermarkt se sobrescriben siempre y se
+                    # conservan como versión anterior para el registro de cambios
+                    if child.is_file() and not child.match("jugadores_laliga_*.csv"):
                         child.unlink()
     # Ejecutar scrapers
     if seasons:
         print(f"🛰️  Iniciando descarga para temporadas: {seasons}")
         scrape_transfermarkt(seasons)
-        scrape_fbref(seasons)
+        scrape_fbref(seasons, mode=config.get("fbref_mode", "league"))
+        construir_crosswalk(seasons)
     else:
         print("⚠️  No hay temporadas definidas en la configuración.")
 
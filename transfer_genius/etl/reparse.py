@@ -0,0 +1,171 @@
+"""Regenerar los CSV intermedios a partir del HTML ya cacheado en ``data/raw``.
+
+Cuando se corrige un error en un parser no hace falta volver a descargar
+nada: este módulo recorre las páginas guardadas por los scrapers para las
+fuentes y temporadas elegidas, reparte el parseo (limitado por CPU) entre
+varios procesos con ``ProcessPoolExecutor`` y escribe al final los CSV de
+cada temporada en ``data/interim``.
+
+Uso::
+
+    python -m transfer_genius.etl.reparse --seasons 2022 2023 --workers 8
+
+Actualmente sólo Transfermarkt guarda HTML en disco; FBref se lee
+directamente con ``pd.read_html`` y no tiene caché que reparsear.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import pathlib
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, List, Tuple
+
+import pandas as pd
+
+from transfer_genius.etl.scraper_transfermarkt import (
+    club_filename,
+    get_club_list,
+    parse_club_table,
+    save_season_csv,
+)
+from transfer_genius.utils.config import load_config
+
+RAW_DIR = pathlib.Path("data/raw")
+
+# Unidad de trabajo: (fuente, temporada, ruta del HTML, nombre del club, id del club)
+Tarea = Tuple[str, int, str, str, int | None]
+# Resultado compacto: columna -> lista de valores
+Columnas = Dict[str, List[Any]]
+# Fuente: (listar tareas, parsear una tarea, guardar una temporada)
+Fuente = Tuple[
+    Callable[..., List[Tarea]],
+    Callable[[Tarea], Columnas],
+    Callable[..., pathlib.Path],
+]
+
+
+def listar_tareas_transfermarkt(
+    seasons: List[int], raw_dir: pathlib.Path = RAW_DIR
+) -> List[Tarea]:
+    """Listar las plantillas cacheadas de Transfermarkt para cada temporada.
+
+    El nombre real de cada club se recupera de ``clubs.html`` para que el
+    resultado coincida con el de ``scrape_transfermarkt``; las tareas se
+    devuelven en el mismo orden en que aparecen los clubes.
+    """
+    tareas: List[Tarea] = []
+    for temporada in seasons:
+        season_dir = raw_dir / f"tm_laliga_{temporada}"
+        clubs_path = season_dir / "clubs.html"
+        if not clubs_path.exists():
+            print(f"⚠️ No hay caché de Transfermarkt para {temporada}")
+            continue
+        for club in get_club_list(clubs_path):
+            name = club["club_name"]
+            club_path = season_dir / club_filename(name)
+            if club_path.exists():
+                tareas.append(
+                    ("transfermarkt", temporada, str(club_path), name, club["club_id"])
+                )
+    return tareas
+
+
+def parsear_transfermarkt(tarea: Tarea) -> Columnas:
+    _, _, path, club_name, club_id = tarea
+    return parse_club_table(pathlib.Path(path), club_name, club_id).to_dict("list")
+
+
+FUENTES: Dict[str, Fuente] = {
+    "transfermarkt": (
+        listar_tareas_transfermarkt,
+        parsear_transfermarkt,
+        # Reparsear corrige datos ya existentes: sus cambios no son reales
+        partial(save_season_csv, origen="reparse"),
+    ),
+}
+
+
+def _parsear(tarea: Tarea) -> Tuple[Tarea, Columnas | None]:
+    """Ejecutar en un proceso trabajador el parser de la fuente de la tarea."""
+    try:
+        return tarea, FUENTES[tarea[0]][1](tarea)
+    except Exception as e:
+        print(f"❌ Error parseando {tarea[2]}: {e}")
+        return tarea, None
+
+
+def reparse(
+    seasons: List[int],
+    sources: List[str] | None = None,
+    workers: int | None = None,
+    chunksize: int | None = None,
+) -> None:
+    """Reparsear en paralelo el HTML cacheado y escribir los CSV por temporada.
+
+    Parameters
+    ----------
+    seasons: List[int]
+        Años de inicio de temporada a reparsear.
+    sources: List[str] | None
+        Fuentes a procesar (claves de ``FUENTES``).  Por defecto, todas.
+    workers: int | None
+        Número de procesos.  Por defecto, ``os.cpu_count()``.
+    chunksize: int | None
+        Tareas enviadas a cada proceso por lote.  Por defecto se reparten
+        unos cuatro lotes por proceso.
+    """
+    sources = sources or list(FUENTES)
+    workers = workers or os.cpu_count() or 1
+    tareas: List[Tarea] = []
+    for fuente in sources:
+        tareas.extend(FUENTES[fuente][0](seasons))
+    if not tareas:
+        print("⚠️ No hay páginas cacheadas que reparsear.")
+        return
+    chunksize = chunksize or max(1, len(tareas) // (workers * 4))
+    print(
+        f"🔁 Reparseando {len(tareas)} páginas con {workers} procesos "
+        f"(lotes de {chunksize})"
+    )
+
+    resultados: Dict[Tuple[str, int], List[pd.DataFrame]] = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # ``map`` conserva el orden de las tareas, y con él el de los clubes
+        for tarea, columnas in executor.map(_parsear, tareas, chunksize=chunksize):
+            if columnas is None:
+                continue
+            resultados.setdefault((tarea[0], tarea[1]), []).append(
+                pd.DataFrame(columnas)
+            )
+
+    for (fuente, temporada), dfs in sorted(resultados.items()):
+        FUENTES[fuente][2](temporada, pd.concat(dfs, ignore_index=True))
+
+
+def main() -> None:
+    """Punto de entrada para ``python -m transfer_genius.etl.reparse``."""
+    config = load_config()
+    parser = argparse.ArgumentParser(
+        description="Reparsear el HTML cacheado en data/raw"
+    )
+    parser.add_argument(
+        "--seasons", type=int, nargs="+", default=config.get("seasons", [])
+    )
+    parser.add_argument(
+        "--sources", nargs="+", choices=list(FUENTES), default=list(FUENTES)
+    )
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunksize", type=int, default=None)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    reparse([int(s) for s in args.seasons], args.sources, args.workers, args.chunksize)
+    print(f"⏱️  Reparseo completado en {time.perf_counter()-t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,91 @@
 import time
+from io import StringIO
 import pandas as pd
 from pathlib import Path
 import re
 from typing import List
 
+import requests
+
 from transfer_genius.utils.config import load_config
+from transfer_genius.utils.normalization import parse_age
 
 TABLAS_UTILES = [0, 2, 3, 4, 5, 7, 8, 9, 10, 11]
+# Páginas de liga equivalentes a ``TABLAS_UTILES`` (mismo orden): slug de la
+# URL e id de la tabla de jugadores dentro del HTML.
+TABLAS_LIGA = [
+    ("stats", "stats_standard"),
+    ("keepers", "stats_keeper"),
+    ("keepersadv", "stats_keeper_adv"),
+    ("shooting", "stats_shooting"),
+    ("passing", "stats_passing"),
+    ("gca", "stats_gca"),
+    ("defense", "stats_defense"),
+    ("possession", "stats_possession"),
+    ("playingtime", "stats_playing_time"),
+    ("misc", "stats_misc"),
+]
+HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/125.0.0.0 Safari/537.36"
+    )
+}
+# Columna con enlace -> (columna de id, patrón del id en la URL)
+IDS_FBREF = {
+    "Player": ("fbref_player_id", r"/players/([0-9a-f]{8})/"),
+    "Squad": ("fbref_squad_id", r"/squads/([0-9a-f]{8})/"),
+}
+MODOS_FBREF = {"league", "team"}
+# "1,234" o "-1,234.5": números con separador de miles
+NUMERO_CON_MILES = r"[-+]?\d[\d,]*(?:\.\d+)?"
 OUTPUT_DIR = Path("data/interim")
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
+def descargar_html(url: str) -> str:
+    resp = requests.get(url, headers=HEADERS, timeout=60)
+    resp.raise_for_status()
+    return resp.text
+
+def leer_tablas_fbref(html: str, **kwargs) -> list[pd.DataFrame]:
+    """Leer las tablas de un HTML de FBref añadiendo los ids de jugador y equipo.
+
+    El HTML se lee una sola vez con ``extract_links="body"``: cada celda
+    llega como ``(texto, enlace)``.  Los enlaces de ``Player`` y ``Squad``
+    dan los ids y el texto recupera los tipos que ``pd.read_html`` infiere
+    por defecto.  Las tablas se devuelven con las columnas aplanadas.
+    """
+    tablas = pd.read_html(StringIO(html), header=[0, 1], extract_links="body", **kwargs)
+    return [añadir_ids_fbref(df) for df in tablas]
+
+def añadir_ids_fbref(df: pd.DataFrame) -> pd.DataFrame:
+    df = flatten_columns(df)
+    ids = {
+        col_id: df[col].str[1].str.extract(patron, expand=False)
+        for col, (col_id, patron) in IDS_FBREF.items()
+        if col in df.columns
+    }
+    return df.apply(texto_celdas).assign(**ids)
+
+def texto_celdas(col: pd.Series) -> pd.Series:
+    """Quedarse con el texto de celdas ``(texto, enlace)``.
+
+    Como ``pd.read_html``, las celdas vacías pasan a ``NaN``, se quita la
+    "," de miles de los números y la columna se convierte a número sólo si
+    todos sus valores lo son.
+    """
+    texto = col.str[0]
+    texto = texto.mask(texto == "")
+    es_numero = texto.str.fullmatch(NUMERO_CON_MILES, na=False)
+    texto = texto.mask(es_numero, texto.str.replace(",", "", regex=False))
+    numeros = pd.to_numeric(texto, errors="coerce")
+    if numeros.notna().sum() == texto.notna().sum():
+        return numeros
+    return texto.infer_objects()
+
 def extraer_tablas_utiles(URL: str, indices_utiles: list[int]) -> list[pd.DataFrame]:
-    tablas = pd.read_html(URL, header=[0, 1])
+    tablas = leer_tablas_fbref(descargar_html(URL))
     print(f"📊 Tablas totales encontradas: {len(tablas)}")
 
     tablas_utiles = []
@@ -49,7 +123,10 @@ def limpiar_tabla(df: pd.DataFrame) -> pd.DataFrame:
 
     return df
 
-def merge_controlado_por_player(tablas: list[pd.DataFrame]) -> pd.DataFrame:
+def merge_controlado_por_player(
+    tablas: list[pd.DataFrame], claves: list[str] | None = None
+) -> pd.DataFrame:
+    claves = claves or ['Player']
     tablas_limpias = [limpiar_tabla(df) for df in tablas if df is not None]
     df_base = tablas_limpias[0]
 
@@ -57,7 +134,7 @@ def merge_controlado_por_player(tablas: list[pd.DataFrame]) -> pd.DataFrame:
         columnas_base = set(df_base.columns)
         columnas_nueva = set(df_nueva.columns)
 
-        columnas_duplicadas = (columnas_base & columnas_nueva) - {'Player'}
+        columnas_duplicadas = (columnas_base & columnas_nueva) - set(claves)
         if columnas_duplicadas:
             print(f"🔁 Paso {i}: eliminando duplicadas → {columnas_duplicadas}")
             df_nueva = df_nueva.drop(columns=columnas_duplicadas, errors='ignore')
@@ -65,23 +142,102 @@ def merge_controlado_por_player(tablas: list[pd.DataFrame]) -> pd.DataFrame:
         columnas_nuevas = set(df_nueva.columns) - columnas_base
         print(f"➕ Paso {i}: nuevas columnas añadidas → {columnas_nuevas}")
 
-        df_base = pd.merge(df_base, df_nueva, on='Player', how='outer')
+        df_base = pd.merge(df_base, df_nueva, on=claves, how='outer')
 
     return df_base
 
-def scrape_fbref(seasons: List[int]) -> None:
-    """Extraer y procesar estadísticas de La Liga desde FBref.
+def leer_tabla_liga(url: str, table_id: str) -> pd.DataFrame:
+    """Descargar una página de estadísticas de liga y devolver su tabla de jugadores.
+
+    FBref incluye las tablas de jugadores de las páginas de competición
+    dentro de comentarios HTML, por lo que ``pd.read_html`` no las ve
+    directamente.  Se eliminan los marcadores de comentario antes de
+    buscar la tabla por su ``id``.
+    """
+    html = descargar_html(url).replace("<!--", "").replace("-->", "")
+    return leer_tablas_fbref(html, attrs={"id": table_id})[0]
+
+def extraer_tablas_liga(season_label: str) -> list[pd.DataFrame]:
+    """Descargar las tablas de jugadores de toda la liga para una temporada."""
+    tablas = []
+    for slug, table_id in TABLAS_LIGA:
+        url = (
+            f"https://fbref.com/en/comps/12/{season_label}/{slug}/"
+            f"{season_label}-La-Liga-Stats"
+        )
+        print(f"📥 {table_id} → {url}")
+        tablas.append(leer_tabla_liga(url, table_id))
+        time.sleep(5)  # para evitar bloqueo excesivo
+    return tablas
 
-    Para cada temporada indicada, se descargan los equipos de la liga,
-    luego se extraen tablas relevantes de cada equipo y se guardan los
-    resultados en ``data/interim/fbref_laliga_<year>.csv``.
+def extraer_id_fbref_squad(url: str) -> str | None:
+    match = re.search(IDS_FBREF["Squad"][1], url)
+    return match.group(1) if match else None
+
+def _tiene_ids(df: pd.DataFrame, claves_id: list[str]) -> bool:
+    if not set(claves_id) <= set(df.columns):
+        return False
+    jugadores = df[df["Player"] != "Player"]
+    return bool(jugadores[claves_id].notna().all().all())
+
+def merge_tablas_liga(tablas: list[pd.DataFrame]) -> pd.DataFrame:
+    """Unir las tablas de liga con el mismo esquema que el modo por equipo.
+
+    Las tablas de liga contienen una fila por jugador y equipo, por lo que
+    se combinan por ``fbref_player_id`` y ``fbref_squad_id`` (o por
+    ``Player`` y ``Squad`` si a alguna fila le falta el id).  Después se
+    descartan las columnas propias de estas páginas (``Rk``, ``Born``) y
+    ``Squad`` pasa a ser ``Team``.  Los ids de FBref, si existen, quedan al
+    final.
+    """
+    tablas = [
+        flatten_columns(df).drop(columns=["Rk", "Born"], errors="ignore")
+        for df in tablas
+    ]
+    # Con los ids de FBref se une por clave; si falta alguno, por nombre y equipo
+    claves_id = [c for c, _ in IDS_FBREF.values()]
+    if all(_tiene_ids(df, claves_id) for df in tablas):
+        claves = claves_id
+    else:
+        claves = ["Player", "Squad"]
+    df = merge_controlado_por_player(tablas, claves=claves)
+    df = df.rename(columns={"Squad": "Team"})
+    return normalizar_esquema(df)
+
+def normalizar_esquema(df: pd.DataFrame) -> pd.DataFrame:
+    """Dejar la salida de ambos modos con el mismo esquema.
+
+    ``Age`` pasa a entero (FBref la muestra como "años-días" en la
+    temporada en curso) y ``Team`` y los ids de FBref quedan al final.
+    """
+    if "Age" in df.columns:
+        df["Age"] = parse_age(df["Age"])
+    finales = ["Team"] + [c for c, _ in IDS_FBREF.values() if c in df.columns]
+    columnas = [c for c in df.columns if c not in finales] + finales
+    return df[columnas]
+
+def scrape_fbref(seasons: List[int], mode: str = "league") -> None:
+    """Extraer y procesar estadísticas de La Liga desde FBref.
+
+    En modo ``league`` se descargan las páginas de estadísticas de toda la
+    competición (una por tipo de tabla) y el equipo de cada fila se toma
+    de la columna ``Squad``.  En modo ``team`` se descargan los equipos de
+    la liga y luego se extraen las tablas relevantes de cada equipo.  En
+    ambos casos los resultados se guardan en
+    ``data/interim/fbref_laliga_<year>.csv`` con el mismo esquema.
 
     Parameters
     ----------
     seasons: List[int]
         Lista de años de inicio de temporada (por ejemplo, 2017 para
         2017/18).
+    mode: str
+        ``"league"`` (por defecto) o ``"team"``.
     """
+    if mode not in MODOS_FBREF:
+        raise ValueError(
+            f"Modo de FBref desconocido: {mode!r} (usa {sorted(MODOS_FBREF)})"
+        )
     for year in seasons:
         season_label = f"{year}-{year+1}"
         season_url = f"https://fbref.com/en/comps/12/{season_label}/{season_label}-La-Liga-Stats"
@@ -89,6 +245,16 @@ def scrape_fbref(seasons: List[int]) -> None:
         if output_file.exists():
             print(f"⏭️ Ya existe {output_file.name}, se omite")
             continue
+        if mode == "league":
+            try:
+                print(f"\n📅 Procesando temporada {season_label} (modo liga)")
+                df_final_fbref = merge_tablas_liga(extraer_tablas_liga(season_label))
+                df_final_fbref["Season"] = season_label
+                df_final_fbref.to_csv(output_file, index=False)
+                print(f"✅ Guardado → {output_file.name} ({len(df_final_fbref)} filas)")
+            except Exception as e:
+                print(f"❌ Error en temporada {season_label}: {e}")
+            continue
         try:
             print(f"\n📅 Procesando temporada {season_label} → {season_url}")
             la_liga = pd.read_html(season_url, extract_links="all")[0]
@@ -106,6 +272,8 @@ def scrape_fbref(seasons: List[int]) -> None:
                 if df_equipo is None:
                     continue
                 df_equipo["Team"] = nombre
+                df_equipo["fbref_squad_id"] = extraer_id_fbref_squad(url)
+                df_equipo = normalizar_esquema(df_equipo)
                 df_equipo["Season"] = season_label
                 dfs.append(df_equipo)
                 time.sleep(5)  # para evitar bloqueo excesivo
@@ -124,7 +292,7 @@ def main() -> None:
     config = load_config()
     seasons = config.get("seasons", [2018])
     seasons = [int(s) for s in seasons]
-    scrape_fbref(seasons)
+    scrape_fbref(seasons, mode=config.get("fbref_mode", "league"))
 
 
 if __name__ == "__main__":
@@ -4,6 +4,13 @@ import pandas as pd
 import pathlib
 import time
 
+from transfer_genius.utils.ids import TM_CLUB_ID, TM_PLAYER_ID, extraer_id_tm
+from transfer_genius.utils.normalization import (
+    join_nationalities,
+    normalize_market_value,
+    parse_age,
+)
+
 HEADERS = {
     "User-Agent": (
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -72,6 +79,8 @@ def parse_table(path: pathlib.Path) -> pd.DataFrame:
 
             club_img = html_tr.select_one("td:nth-child(5) img")
             club = club_img.get("alt", "").strip() if club_img else ""
+            club_tag = html_tr.select_one("td:nth-child(5) a")
+            club_href = str(club_tag.get("href", "")).strip() if club_tag else ""
 
             nat_imgs = html_tr.select("td:nth-child(3) img")
             nationalities = [img.get("title", "").strip() for img in nat_imgs]
@@ -86,7 +95,8 @@ def parse_table(path: pathlib.Path) -> pd.DataFrame:
                 "market_value": mv,
                 "club": club,
                 "nationality": nationalities,
-                "player_url": player_url
+                "player_url": player_url,
+                "club_href": club_href
             })
         except Exception as e:
             print(f"❌ Error en fila {i}: {e}")
@@ -94,19 +104,11 @@ def parse_table(path: pathlib.Path) -> pd.DataFrame:
 
     df = pd.DataFrame(rows)
 
-    def parse_market_value(x):
-        try:
-            x = x.replace("€", "").replace("-", "0").strip()
-            if "m" in x:
-                return float(x.replace("m", ""))
-            elif "Th." in x:
-                return float(x.replace("Th.", "")) / 1000
-            else:
-                return 0.0
-        except:
-            return 0.0
-
-    df["mv_millions"] = df["market_value"].apply(parse_market_value)
+    df["age"] = parse_age(df["age"])
+    df["nationality"] = join_nationalities(df["nationality"])
+    normalize_market_value(df)
+    df["tm_player_id"] = extraer_id_tm(df["player_url"], TM_PLAYER_ID)
+    df["tm_club_id"] = extraer_id_tm(df.pop("club_href"), TM_CLUB_ID)
     print(f"🔍 {path.name} → {len(df)} jugadores")
     return df
 
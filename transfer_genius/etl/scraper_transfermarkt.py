@@ -1,9 +1,19 @@
 import requests
 import pathlib
+import re
 import pandas as pd
 import time
 from bs4 import BeautifulSoup
 
+from transfer_genius.etl.changelog import registrar_cambios
+from transfer_genius.utils.config import load_config
+from transfer_genius.utils.ids import TM_CLUB_ID, TM_PLAYER_ID, extraer_id_tm
+from transfer_genius.utils.normalization import (
+    join_nationalities,
+    normalize_market_value,
+    parse_birth_date_age,
+)
+
 HEADERS = {
     "User-Agent": (
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -12,13 +22,12 @@ HEADERS = {
     )
 }
 
-from transfer_genius.utils.config import load_config
-
 # Temporadas se obtendrán dinámicamente del archivo de configuración.  La lista
 # ``TEMPORADAS`` queda como valor por defecto para compatibilidad retro.  Si
 # se ejecuta este módulo directamente, se cargará la configuración y se
 # sobreescribirá.
 TEMPORADAS = list(range(2017, 2026))  # De 2017/18 a 2025/26
+INTERIM_DIR = pathlib.Path("data/interim")
 
 # Función robusta para descargar HTML
 def download_html_safe(url: str, path: pathlib.Path, retries=3, delay=10):
@@ -51,14 +60,45 @@ def get_club_list(html_path: pathlib.Path):
         club_href = a.get("href", "").strip()
         if club_name and "/startseite/verein/" in club_href:
             full_url = f"https://www.transfermarkt.com{club_href}"
+            club_id = re.search(TM_CLUB_ID, club_href)
             clubs.append({
                 "club_name": club_name,
-                "club_url": full_url
+                "club_url": full_url,
+                "club_id": int(club_id.group(1)) if club_id else None
             })
 
     return clubs
 
 
+def club_filename(club_name: str) -> str:
+    """Nombre del fichero HTML cacheado para la plantilla de un club."""
+    return f"plantilla_{club_name.lower().replace(' ', '_')}.html"
+
+
+def season_label(temporada: int) -> str:
+    """Etiqueta de temporada de los CSV de Transfermarkt (``2017/18``)."""
+    return f"{temporada}/{str(temporada+1)[-2:]}"
+
+
+def save_season_csv(
+    temporada: int,
+    df: pd.DataFrame,
+    origen: str = "scrape",
+    out_dir: pathlib.Path = INTERIM_DIR,
+) -> pathlib.Path:
+    """Escribir ``jugadores_laliga_<year>.csv`` registrando antes los cambios.
+
+    ``origen`` marca las entradas del registro (``scrape`` o ``reparse``).
+    """
+    df["season"] = season_label(temporada)
+    out_csv = out_dir / f"jugadores_laliga_{temporada}.csv"
+    out_csv.parent.mkdir(parents=True, exist_ok=True)
+    registrar_cambios(out_csv, df, "transfermarkt", temporada, origen)
+    df.to_csv(out_csv, index=False)
+    print(f"💾 Guardado {out_csv.name} ({len(df)} jugadores)")
+    return out_csv
+
+
 def download_club_html(club: dict, path: pathlib.Path):
     if path.exists():
         print(f"⏭️ Ya existe plantilla de {club['club_name']}")
@@ -68,7 +108,9 @@ def download_club_html(club: dict, path: pathlib.Path):
     download_html_safe(url, path)
 
 
-def parse_club_table(path: pathlib.Path, club_name: str) -> pd.DataFrame:
+def parse_club_table(
+    path: pathlib.Path, club_name: str, club_id: int | None = None
+) -> pd.DataFrame:
     df_raw = pd.read_html(path, flavor="lxml")[1]
     df_raw = df_raw[['#', 'Player', 'Date of birth/Age', 'Nat.', 'Market value']].copy()
 
@@ -107,15 +149,9 @@ def parse_club_table(path: pathlib.Path, club_name: str) -> pd.DataFrame:
             else:
                 continue
 
+            # Texto "Jun 24, 1987 (36)"; se normaliza después por columnas
             age_cell = html_tr.select_one("td:nth-child(3)")
-            age = None
-            if age_cell:
-                age_txt = age_cell.text.strip()
-                if "(" in age_txt:
-                    try:
-                        age = int(age_txt.split("(")[1].replace(")", ""))
-                    except:
-                        age = None
+            age = age_cell.text.strip() if age_cell else None
 
             nat_imgs = html_tr.select("td:nth-child(4) img")
             nationalities = [img.get("title", "").strip() for img in nat_imgs]
@@ -140,20 +176,18 @@ def parse_club_table(path: pathlib.Path, club_name: str) -> pd.DataFrame:
 
     df = pd.DataFrame(rows)
 
-    def parse_market_value(x):
-        try:
-            x = x.replace("€", "").replace("-", "0").strip()
-            if "m" in x:
-                return float(x.replace("m", ""))
-            elif "Th." in x or "k" in x:
-                return float(x.replace("Th.", "").replace("k", "")) / 1000
-            else:
-                return 0.0
-        except:
-            return 0.0
+    if df.empty:
+        return df
+
+    nacimiento = parse_birth_date_age(df["age"])
+    df["age"] = nacimiento["age"]
+    df.insert(df.columns.get_loc("age"), "birth_date", nacimiento["birth_date"])
+    df["nationality"] = join_nationalities(df["nationality"])
+    normalize_market_value(df)
 
-    if "market_value" in df.columns:
-        df["mv_millions"] = df["market_value"].apply(parse_market_value)
+    if "player_url" in df.columns:
+        df["tm_player_id"] = extraer_id_tm(df["player_url"], TM_PLAYER_ID)
+        df["tm_club_id"] = pd.Series(club_id, index=df.index, dtype="Int64")
 
     return df
 
@@ -173,7 +207,7 @@ def scrape_transfermarkt(seasons: list[int]) -> None:
         temporada 2017/18).
     """
     for temporada in seasons:
-        print(f"\n📅 Procesando temporada {temporada}/{str(temporada+1)[-2:]}...")
+        print(f"\n📅 Procesando temporada {season_label(temporada)}...")
         url_temporada = (
             f"https://www.transfermarkt.com/laliga/startseite/wettbewerb/ES1/plus/?saison_id={temporada}"
         )
@@ -186,22 +220,18 @@ def scrape_transfermarkt(seasons: list[int]) -> None:
         all_players_temp: list[pd.DataFrame] = []
         for club in clubs:
             name = club["club_name"]
-            club_filename = f"plantilla_{name.lower().replace(' ', '_')}.html"
-            club_path = pathlib.Path(f"data/raw/tm_laliga_{temporada}") / club_filename
+            club_path = out_path_temp.parent / club_filename(name)
             download_club_html(club, club_path)
             try:
-                df_club = parse_club_table(club_path, name)
-                df_club["season"] = f"{temporada}/{str(temporada+1)[-2:]}"
+                df_club = parse_club_table(club_path, name, club.get("club_id"))
+                df_club["season"] = season_label(temporada)
                 all_players_temp.append(df_club)
             except Exception as e:
                 print(f"❌ Error procesando {name} ({temporada}): {e}")
 
         if all_players_temp:
             df_temp = pd.concat(all_players_temp, ignore_index=True)
-            out_csv = pathlib.Path(f"data/interim/jugadores_laliga_{temporada}.csv")
-            out_csv.parent.mkdir(parents=True, exist_ok=True)
-            df_temp.to_csv(out_csv, index=False)
-            print(f"💾 Guardado {out_csv.name} ({len(df_temp)} jugadores)")
+            save_season_csv(temporada, df_temp)
         time.sleep(1)  # reducir tiempo de espera por defecto
 
 
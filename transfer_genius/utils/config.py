@@ -19,6 +19,7 @@ except ImportError:
 DEFAULT_CONFIG = {
     "seasons": list(range(2017, 2026)),
     "mode": "cache",  # "real" or "cache"
+    "fbref_mode": "league",  # "league" or "team"
     "retries": 3,
     "delay": 10,
     "timeout": 30,
@@ -0,0 +1,35 @@
+"""Helpers to extract stable source identifiers from scraped URLs.
+
+Transfermarkt and FBref embed a numeric or short hexadecimal id in the
+URLs of every player and club.  Keeping those ids next to the names
+allows cross-season and cross-source joins on compact keys instead of
+comparing normalised strings.
+"""
+
+from __future__ import annotations
+
+import pandas as pd
+
+TM_PLAYER_ID = r"/spieler/(\d+)"
+TM_CLUB_ID = r"/verein/(\d+)"
+
+
+def extraer_id_tm(urls: pd.Series, patron: str) -> pd.Series:
+    """Extract a Transfermarkt id from a column of URLs.
+
+    Parameters
+    ----------
+    urls: pd.Series
+        Column of absolute or relative Transfermarkt URLs.
+    patron: str
+        Regular expression with one capturing group, e.g.
+        ``TM_PLAYER_ID``.
+
+    Returns
+    -------
+    pd.Series
+        Nullable integer series (``Int64``); rows without a match are
+        ``<NA>``.
+    """
+    ids = urls.astype("string").str.extract(patron, expand=False)
+    return pd.to_numeric(ids).astype("Int64")
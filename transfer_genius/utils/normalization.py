@@ -0,0 +1,113 @@
+"""Vectorised normalisation of player attributes shared by all scrapers.
+
+Transfermarkt and FBref render market values, ages, birth dates and
+nationalities as free text.  The helpers in this module parse a whole
+column at once with pandas string/regex operations so every scraper
+applies the same rules and a page is normalised with a handful of
+column-wide operations instead of one Python call per row.
+"""
+
+from __future__ import annotations
+
+import re
+
+import pandas as pd
+
+# "€1.50m", "€500k", "€500Th.", "€1.20bn", "1,50 Mio. €", "750 Tsd. €", "€900"
+MONEY_PATTERN = re.compile(
+    r"^€?\s*(?P<num>\d+(?:[.,]\d+)?)\s*(?P<suffix>bn|b|mio\.?|m|tsd\.?|th\.?|k)?\s*€?$",
+    re.IGNORECASE,
+)
+MONEY_MULTIPLIERS = {
+    "bn": 1e9,
+    "b": 1e9,
+    "mio": 1e6,
+    "m": 1e6,
+    "tsd": 1e3,
+    "th": 1e3,
+    "k": 1e3,
+}
+# Values Transfermarkt shows when a player has no market value
+NO_VALUE = ["-", ""]
+
+# "Jun 24, 1987 (36)" or "24/06/1987 (36)"; the age may be missing
+BIRTH_AGE_PATTERN = re.compile(r"^(?P<birth>.*?)\s*(?:\((?P<age>\d+)\))?$")
+# "36", "(36)" or FBref's "36-123" (years-days)
+AGE_PATTERN = re.compile(r"^\(?(?P<age>\d+)")
+
+NATIONALITY_SEPARATOR = "|"
+
+
+def parse_market_value(values: pd.Series) -> pd.Series:
+    """Parse Transfermarkt money strings into euros.
+
+    Parameters
+    ----------
+    values: pd.Series
+        Raw strings such as ``"€1.50m"``, ``"€500k"``, ``"€500Th."`` or
+        ``"€1.20bn"``.  Commas are accepted as decimal separators.
+
+    Returns
+    -------
+    pd.Series
+        Float series in euros.  ``"-"`` and empty strings (no market
+        value) become ``0.0``; anything else that cannot be parsed becomes
+        ``NaN`` instead of silently turning into zero.
+    """
+    text = values.astype("string").str.strip()
+    parts = text.str.extract(MONEY_PATTERN)
+    number = pd.to_numeric(
+        parts["num"].str.replace(",", ".", regex=False), errors="coerce"
+    )
+    multiplier = (
+        parts["suffix"].str.lower().str.rstrip(".").map(MONEY_MULTIPLIERS).fillna(1.0)
+    )
+    euros = (number * multiplier).astype(float)
+    return euros.mask(text.isin(NO_VALUE).fillna(False), 0.0)
+
+
+def normalize_market_value(
+    df: pd.DataFrame, column: str = "market_value"
+) -> pd.DataFrame:
+    """Add ``market_value_eur`` and ``mv_millions`` parsed from ``column``."""
+    euros = parse_market_value(df[column])
+    df["market_value_eur"] = euros
+    df["mv_millions"] = euros / 1e6
+    return df
+
+
+def parse_age(values: pd.Series) -> pd.Series:
+    """Parse ages written as ``"36"``, ``"(36)"`` or ``"36-123"`` into ``Int64``."""
+    text = values.astype("string").str.strip()
+    age = text.str.extract(AGE_PATTERN)["age"]
+    return pd.to_numeric(age, errors="coerce").astype("Int64")
+
+
+def parse_birth_date_age(values: pd.Series) -> pd.DataFrame:
+    """Split Transfermarkt ``"Jun 24, 1987 (36)"`` cells into typed columns.
+
+    Returns
+    -------
+    pd.DataFrame
+        ``birth_date`` (``datetime64``) and ``age`` (``Int64``), aligned
+        with ``values``.  Unparseable or absent parts (a cell with only
+        the date) are missing values.
+    """
+    text = values.astype("string").str.strip()
+    parts = text.str.extract(BIRTH_AGE_PATTERN)
+    birth = pd.to_datetime(parts["birth"], format="%b %d, %Y", errors="coerce")
+    birth = birth.fillna(
+        pd.to_datetime(parts["birth"], format="%d/%m/%Y", errors="coerce")
+    )
+    return pd.DataFrame(
+        {
+            "birth_date": birth,
+            "age": pd.to_numeric(parts["age"], errors="coerce").astype("Int64"),
+        },
+        index=values.index,
+    )
+
+
+def join_nationalities(values: pd.Series) -> pd.Series:
+    """Collapse lists of nationalities into ``"Spain|France"`` strings."""
+    return values.str.join(NATIONALITY_SEPARATOR).astype("string")